@@ -6,16 +6,39 @@ directive somewhere.
 """
 
 import re
-from collections import defaultdict
+import sys
+import json
+from hashlib import sha1
+from os import replace, stat
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from sphinx.errors import DocumentError
 from pathlib import Path
-from os.path import abspath, dirname, join as pathjoin, sep, relpath
+from os.path import abspath, basename, dirname, join as pathjoin, sep, relpath, splitext
+
+try:
+    # optional, much faster (rust-based) directory traversal
+    import vexy_glob
+except ImportError:
+    vexy_glob = None
+
+try:
+    # optional, much faster (DFA-based) regex engine for scanning for links
+    import re2 as _link_re
+
+    # re2's \w is ascii-only, so we spell out the unicode word characters
+    _WORDCHARS = r"\pL\pN_"
+except ImportError:
+    _link_re = re
+    _WORDCHARS = r"\w"
 
 _IGNORE_FILES = []
 _SOURCEDIR_NAME = "source"
 _SOURCE_DIR = pathjoin(dirname(dirname(abspath(__file__))), _SOURCEDIR_NAME)
 _TOC_FILE = pathjoin(_SOURCE_DIR, "toc.md")
-_NO_REMAP_STARTSWITH = [
+# remembers which files were already processed, to skip them next build
+_CACHE_FILE = pathjoin(_SOURCE_DIR, ".autolink.cache.json")
+_NO_REMAP_STARTSWITH = (
     "http://",
     "https://",
     "github:",
@@ -24,200 +47,407 @@ _NO_REMAP_STARTSWITH = [
     "report-bug",
     "issue",
     "bug-report",
-]
+)
+
+# normal reference-links [txt](urls) or in-document references [txt]: url,
+# combined so that each file only needs to be scanned once
+# (flags are inlined and no lookaheads are used, to be compatible with re2)
+_REF_REGEX = _link_re.compile(
+    rf"(?ims)\[(?P<txt>[{_WORDCHARS} -\[\]\`]+?)\]\((?P<url>.+?)\)"
+    rf"|\[(?P<doctxt>[{_WORDCHARS} -\`]+?)\]:\s+?(?P<docurl>.+?)$"
+)
+# splits a link url like ../Foo/Bar.md#anchor into its doc name and anchor
+_URL_REGEX = re.compile(r"(?:.*/)?(?P<fname>.*?)(?:#(?P<anchor>[^#]*?))?(?:\.[^.]*)?", re.S)
 
 TXT_REMAPS = {}
 URL_REMAPS = {}
+# lets us skip the remap lookups for every link in the common case of no remaps
+_HAS_REMAPS = bool(TXT_REMAPS or URL_REMAPS)
 
 _USED_REFS = {}
+# log lines are collected here and written out in one go at the end
+_LOG_BUF = []
 
-_CURRFILE = None
+# {docname: (dir, filename)} for all doc files, set up in each worker process
+_DOC_LOCATIONS = {}
 
 
-def auto_link_remapper(no_autodoc=False):
+def _load_cache(signature):
     """
-    - Auto-Remaps links to fit with the actual document file structure. Requires
-      all doc files to have a unique name.
-    - Creates source/toc.md file
+    Load the cache of already-processed files.
+
+    Args:
+        signature (str): Identifies the current set of doc files and remaps. If
+            this differs from that of the stored cache, the cache is invalid,
+            since the links of all files may need to change.
+
+    Returns:
+        dict: `{path: [mtime_ns, size, used_refs]}` for every file that was
+            processed in a previous build.
 
     """
-    global _CURRFILE
+    try:
+        with open(_CACHE_FILE, "r") as fil:
+            cache = json.load(fil)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("signature") != signature:
+        return {}
+    return cache.get("files", {})
 
-    print("  -- Auto-Remapper starting.")
 
-    def _get_rel_source_ref(path):
-        """Get the path relative the source/ dir"""
-        pathparts = path.split("/")
-        # we allow a max of 4 levels of nesting in the source dir
-        ind = pathparts[-5:].index(_SOURCEDIR_NAME)
-        # get the part after source/
-        pathparts = pathparts[-5 + 1 + ind :]
-        url = "/".join(pathparts)
-        # get the reference, without .md
-        url = url.rsplit(".", 1)[0]
-        return url
+def _save_cache(signature, files):
+    """
+    Store the cache of processed files for the next build.
 
-    toc_map = {}
-    docref_map = defaultdict(dict)
+    Args:
+        signature (str): Identifies the current set of doc files and remaps.
+        files (dict): `{path: [mtime_ns, size, used_refs]}` of processed files.
 
-    for path in Path(_SOURCE_DIR).rglob("*.md"):
-        # find the source/ part of the path and strip it out
+    """
+    with open(_CACHE_FILE, "w") as fil:
+        json.dump({"signature": signature, "files": files}, fil)
 
-        if path.name in _IGNORE_FILES:
-            # this is the name including .md
-            continue
 
-        sourcepath = path.as_posix()
-        # get name and url relative to source/
-        fname = path.name.rsplit(".", 1)[0]
-        src_url = _get_rel_source_ref(sourcepath)
+@lru_cache(maxsize=8192)
+def _parse_url(url):
+    """
+    Get the doc name and anchor from a link url. The same urls are linked
+    from many files, so this is cached.
 
-        # check for duplicate files
-        if fname in toc_map:
-            duplicate_src_url = toc_map[fname]
-            raise DocumentError(
-                f" Tried to add {src_url}.md, but a file {duplicate_src_url}.md already exists.\n"
-                " Evennia's auto-link-corrector does not accept doc-files with the same \n"
-                " name, even in different folders. Rename one.\n"
-            )
-        toc_map[fname] = src_url
+    Args:
+        url (str): The url to parse, like `../Foo/Bar.md#anchor`.
+
+    Returns:
+        tuple: `(fname, anchor)`, like `("Bar", "#anchor")`. The anchor
+            is the empty string if the url has none.
+
+    """
+    match = _URL_REGEX.fullmatch(url)
+    anchor = match.group("anchor")
+    return match.group("fname"), ("" if anchor is None else "#" + anchor)
+
+
+def _init_worker(doc_locations):
+    """
+    Set up a worker process for remapping links.
+
+    Args:
+        doc_locations (dict): Map `{docname: (dir, filename)}` of all doc files.
+
+    """
+    global _DOC_LOCATIONS, _HAS_REMAPS
+    _DOC_LOCATIONS = doc_locations
+    # the remaps may have been changed since this module was imported
+    _HAS_REMAPS = bool(TXT_REMAPS or URL_REMAPS)
 
-        # find relative links to all other files
-        for targetpath in Path(_SOURCE_DIR).rglob("*.md"):
-
-            targetname = targetpath.name.rsplit(".", 1)[0]
-            targetpath = targetpath.as_posix()
-            url = relpath(targetpath, dirname(sourcepath))
-            if not "/" in url:
-                # need to be explicit or there will be link ref collisions between
-                # e.g. TickerHandler page and TickerHandle api node
-                url = "./" + url
-            docref_map[sourcepath][targetname] = url.rsplit(".", 1)[0]
-
-    # normal reference-links [txt](urls)
-    ref_regex = re.compile(
-        r"\[(?P<txt>[\w -\[\]\`]+?)\]\((?P<url>.+?)\)", re.I + re.S + re.U + re.M
-    )
-    # in document references
-    ref_doc_regex = re.compile(
-        r"\[(?P<txt>[\w -\`]+?)\]:\s+?(?P<url>.+?)(?=$|\n)", re.I + re.S + re.U + re.M
-    )
-
-    def _sub(match):
+
+@lru_cache(maxsize=8192)
+def _rel_url(sourcedir, fname):
+    """
+    Get the url to a doc file, relative to a given directory. Only the urls that
+    are actually linked to are ever calculated.
+
+    Args:
+        sourcedir (str): The posix-style directory to link from.
+        fname (str): The name of the doc to link to, without .md.
+
+    Returns:
+        str or None: The relative url, without .md, or `None` if there is no
+            doc file with this name.
+
+    """
+    location = _DOC_LOCATIONS.get(fname)
+    if location is None:
+        return None
+    targetdir, targetfile = location
+    reldir = relpath(targetdir, sourcedir)
+    if reldir == ".":
+        # need to be explicit or there will be link ref collisions between
+        # e.g. TickerHandler page and TickerHandle api node
+        url = "./" + targetfile
+    else:
+        url = reldir + "/" + targetfile
+    return splitext(url)[0]
+
+
+class LinkRewriter:
+    """
+    Remaps the links of a single doc file. Its methods are used as the
+    substitution callbacks when running the link regex over the file.
+
+    """
+
+    __slots__ = ("sourcedir", "cfilename", "is_toc", "used_refs", "messages", "changed")
+
+    def __init__(self, path, remap=True):
+        """
+        Args:
+            path (str): The posix-style path to the .md file to process.
+            remap (bool, optional): If the links in this file should be remapped
+                at all, or only collected.
+
+        """
+        # the dir to link relative to; None if this file should not be remapped
+        self.sourcedir = dirname(path) if remap else None
+        self.cfilename = basename(path)
+        self.is_toc = path.endswith("toc.md")
+        # all docs referenced from this file, as {fname: url}
+        self.used_refs = {}
+        # log messages to show for this file
+        self.messages = []
+        # if any link was changed, meaning the file must be rewritten
+        self.changed = False
+
+    def sub(self, match):
         # inline reference links
-        global _USED_REFS
         grpdict = match.groupdict()
         txt, url = grpdict["txt"], grpdict["url"]
 
-        txt = TXT_REMAPS.get(txt, txt)
-        url = URL_REMAPS.get(url, url)
+        if _HAS_REMAPS:
+            txt = TXT_REMAPS.get(txt, txt)
+            url = URL_REMAPS.get(url, url)
 
-        if any(url.startswith(noremap) for noremap in _NO_REMAP_STARTSWITH):
+        if url.startswith(_NO_REMAP_STARTSWITH):
             return f"[{txt}]({url})"
 
         if "http" in url and "://" in url:
             urlout = url
         else:
-            fname, *part = url.rsplit("/", 1)
-            fname = part[0] if part else fname
-            fname = fname.rsplit(".", 1)[0]
-            fname, *anchor = fname.rsplit("#", 1)
+            fname, anchor = _parse_url(url)
 
-            if not _CURRFILE.endswith("toc.md"):
-                _USED_REFS[fname] = url
+            if not self.is_toc:
+                self.used_refs[fname] = url
 
-            if _CURRFILE in docref_map and fname in docref_map[_CURRFILE]:
-                cfilename = _CURRFILE.rsplit("/", 1)[-1]
-                urlout = docref_map[_CURRFILE][fname] + ("#" + anchor[0] if anchor else "")
+            docurl = None if self.sourcedir is None else _rel_url(self.sourcedir, fname)
+            if docurl is not None:
+                urlout = docurl + anchor
                 if urlout != url:
-                    print(f"  {cfilename}: [{txt}]({url}) -> [{txt}]({urlout})")
+                    self.messages.append(
+                        f"  {self.cfilename}: [{txt}]({url}) -> [{txt}]({urlout})"
+                    )
             else:
                 urlout = url
 
         return f"[{txt}]({urlout})"
 
-    def _sub_doc(match):
+    def sub_doc(self, match):
         # reference links set at the bottom of the page
-        global _USED_REFS
         grpdict = match.groupdict()
-        txt, url = grpdict["txt"], grpdict["url"]
+        txt, url = grpdict["doctxt"], grpdict["docurl"]
 
-        txt = TXT_REMAPS.get(txt, txt)
-        url = URL_REMAPS.get(url, url)
+        if _HAS_REMAPS:
+            txt = TXT_REMAPS.get(txt, txt)
+            url = URL_REMAPS.get(url, url)
 
-        if any(url.startswith(noremap) for noremap in _NO_REMAP_STARTSWITH):
+        if url.startswith(_NO_REMAP_STARTSWITH):
             return f"[{txt}]: {url}"
 
         if "http" in url and "://" in url:
             urlout = url
         else:
-            fname, *part = url.rsplit("/", 1)
-            fname = part[0] if part else fname
-            fname = fname.rsplit(".", 1)[0]
-            fname, *anchor = fname.rsplit("#", 1)
+            fname, anchor = _parse_url(url)
 
-            if not _CURRFILE.endswith("toc.md"):
-                _USED_REFS[fname] = url
+            if not self.is_toc:
+                self.used_refs[fname] = url
 
-            if _CURRFILE in docref_map and fname in docref_map[_CURRFILE]:
-                cfilename = _CURRFILE.rsplit("/", 1)[-1]
-                urlout = docref_map[_CURRFILE][fname] + ("#" + anchor[0] if anchor else "")
+            docurl = None if self.sourcedir is None else _rel_url(self.sourcedir, fname)
+            if docurl is not None:
+                urlout = docurl + anchor
                 if urlout != url:
-                    print(f"  {cfilename}: [{txt}]: {url} -> [{txt}]: {urlout}")
+                    self.messages.append(
+                        f"  {self.cfilename}: [{txt}]: {url} -> [{txt}]: {urlout}"
+                    )
             else:
                 urlout = url
 
         return f"[{txt}]: {urlout}"
 
-    # replace / correct links in all files
-    count = 0
-    for path in sorted(Path(_SOURCE_DIR).rglob("*.md"), key=lambda p: p.name):
+    def sub_any(self, match):
+        # the last group matched tells us which type of link we found
+        if match.lastgroup == "url":
+            out = self.sub(match)
+        else:
+            out = self.sub_doc(match)
+        if not self.changed and out != match.group(0):
+            self.changed = True
+        return out
+
+
+def _process_file(path, remap=True):
+    """
+    Remap the links in a single doc file. This is run in a worker process,
+    so it must only rely on its arguments and on module-level data.
+
+    Args:
+        path (str): The posix-style path to the .md file to process.
+        remap (bool, optional): If the links in this file should be remapped
+            at all, or only collected.
+
+    Returns:
+        tuple: `(changed, used_refs, messages)`, where `changed` is if the
+            file was rewritten, `used_refs` is a dict `{fname: url}` of all
+            docs referenced from this file and `messages` are the log
+            messages to show for this file.
+
+    """
+    rewriter = LinkRewriter(path, remap=remap)
+
+    with open(path, "r", encoding="utf-8") as fil:
+        intxt = fil.read()
+    outtxt, nsubs = _REF_REGEX.subn(rewriter.sub_any, intxt)
+    # no need to compare the full texts, we know if any link changed
+    changed = nsubs > 0 and rewriter.changed
+    if changed:
+        # write to a temp-file next to the original and move it into place, so
+        # a doc file is never left half-written
+        tmppath = path + ".tmp"
+        with open(tmppath, "w", encoding="utf-8") as fil:
+            fil.write(outtxt)
+        replace(tmppath, path)
+
+    return changed, rewriter.used_refs, rewriter.messages
 
-        # from pudb import debugger;debugger.Debugger().set_trace()
-        _CURRFILE = path.as_posix()
 
-        with open(path, "r") as fil:
-            intxt = fil.read()
-            outtxt = ref_regex.sub(_sub, intxt)
-            outtxt = ref_doc_regex.sub(_sub_doc, outtxt)
-        if intxt != outtxt:
-            with open(path, "w") as fil:
-                fil.write(outtxt)
-            count += 1
-            print(f"  -- Auto-relinked links in {path.name}")
+def _find_doc_files():
+    """
+    Get the paths of all .md files in the source dir, as posix-style strings.
+
+    """
+    if vexy_glob:
+        return [
+            pathjoin(_SOURCE_DIR, path).replace(sep, "/")
+            for path in vexy_glob.find("**/*.md", root=_SOURCE_DIR)
+        ]
+    return [path.as_posix() for path in Path(_SOURCE_DIR).rglob("*.md")]
+
+
+def auto_link_remapper(no_autodoc=False):
+    """
+    - Auto-Remaps links to fit with the actual document file structure. Requires
+      all doc files to have a unique name.
+    - Creates source/toc.md file
+
+    """
+    print("  -- Auto-Remapper starting.")
+
+    def _get_rel_source_ref(path):
+        """Get the path relative the source/ dir"""
+        pathparts = path.split("/")
+        # we allow a max of 4 levels of nesting in the source dir
+        ind = pathparts[-5:].index(_SOURCEDIR_NAME)
+        # get the part after source/
+        pathparts = pathparts[-5 + 1 + ind :]
+        url = "/".join(pathparts)
+        # get the reference, without .md
+        url = splitext(url)[0]
+        return url
+
+    toc_map = {}
+
+    # walk the source dir only once; (filename, name-without-.md, posix-path)
+    all_md = _find_doc_files()
+    names = [(basename(path), splitext(basename(path))[0], path) for path in all_md]
+
+    # where to find each doc; the relative urls between docs are only worked out
+    # (by the workers) for the links that are actually used
+    doc_locations = {}
+    for _, targetname, targetpath in names:
+        targetdir, _, targetfile = targetpath.rpartition("/")
+        doc_locations[sys.intern(targetname)] = (targetdir, targetfile)
+
+    for filename, fname, sourcepath in names:
+        # find the source/ part of the path and strip it out
+
+        if filename in _IGNORE_FILES:
+            # this is the name including .md
+            continue
+
+        # get url relative to source/
+        src_url = _get_rel_source_ref(sourcepath)
+
+        # check for duplicate files
+        if fname in toc_map:
+            duplicate_src_url = toc_map[fname]
+            raise DocumentError(
+                f" Tried to add {src_url}.md, but a file {duplicate_src_url}.md already exists.\n"
+                " Evennia's auto-link-corrector does not accept doc-files with the same \n"
+                " name, even in different folders. Rename one.\n"
+            )
+        toc_map[fname] = src_url
+
+    # files that are unchanged since the last build need not be processed again,
+    # as long as no files were added/moved/removed since then
+    signature = sha1(
+        json.dumps([sorted(all_md), TXT_REMAPS, URL_REMAPS], sort_keys=True).encode()
+    ).hexdigest()
+    cache = _load_cache(signature)
+
+    paths = []
+    for path in sorted(all_md, key=basename):
+        filestat = stat(path)
+        cached = cache.get(path)
+        if cached and cached[:2] == [filestat.st_mtime_ns, filestat.st_size]:
+            _USED_REFS.update(cached[2])
+        else:
+            paths.append(path)
+
+    # replace / correct links in all files
+    count = 0
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(doc_locations,)) as executor:
+        results = executor.map(
+            _process_file,
+            paths,
+            [basename(path) not in _IGNORE_FILES for path in paths],
+            chunksize=16,
+        )
+        for path, (changed, used_refs, messages) in zip(paths, results):
+            _USED_REFS.update(used_refs)
+            _LOG_BUF.extend(messages)
+            if changed:
+                count += 1
+                _LOG_BUF.append(f"  -- Auto-relinked links in {basename(path)}")
+            filestat = stat(path)
+            cache[path] = [filestat.st_mtime_ns, filestat.st_size, used_refs]
+
+    _save_cache(signature, cache)
 
     if count > 0:
-        print(f"  -- Auto-corrected links in {count} documents.")
+        _LOG_BUF.append(f"  -- Auto-corrected links in {count} documents.")
 
     for (fname, src_url) in sorted(toc_map.items(), key=lambda tup: tup[0]):
         if fname not in _USED_REFS:
-            print(f"  ORPHANED DOC: no refs found to {src_url}.md")
+            _LOG_BUF.append(f"  ORPHANED DOC: no refs found to {src_url}.md")
 
-    # write tocfile
-    with open(_TOC_FILE, "w") as fil:
-        fil.write("# Toc\n")
+    # build the tocfile
+    toc = ["# Toc\n"]
 
-        if not no_autodoc:
-            fil.write("- [API root](api/evennia-api.rst)")
+    if not no_autodoc:
+        toc.append("- [API root](api/evennia-api.rst)")
 
-        for ref in sorted(toc_map.values()):
+    for ref in sorted(toc_map.values()):
 
-            if ref == "toc":
-                continue
+        if ref == "toc":
+            continue
+
+        if "Part1/" in ref:
+            continue
 
-            if "Part1/" in ref:
-                continue
+        if not "/" in ref:
+            ref = "./" + ref
 
-            if not "/" in ref:
-                ref = "./" + ref
+        linkname = ref.replace("-", " ")
+        toc.append(f"\n- [{linkname}]({ref})")
 
-            linkname = ref.replace("-", " ")
-            fil.write(f"\n- [{linkname}]({ref})")
+    # we add a self-reference so the toc itself is also a part of a toctree
+    toc.append("\n\n```toctree::\n  :hidden:\n\n  toc\n```")
 
-        # we add a self-reference so the toc itself is also a part of a toctree
-        fil.write("\n\n```toctree::\n  :hidden:\n\n  toc\n```")
+    with open(_TOC_FILE, "w", encoding="utf-8") as fil:
+        fil.write("".join(toc))
 
-    print("  -- Auto-Remapper finished.")
+    _LOG_BUF.append("  -- Auto-Remapper finished.")
+    sys.stdout.write("\n".join(_LOG_BUF) + "\n")
+    _LOG_BUF.clear()
 
 
 if __name__ == "__main__":
@@ -677,6 +677,10 @@ CLIENT_DEFAULT_HEIGHT = 45
 # (excluding webclient with separate help popups). If continuous scroll
 # is preferred, change 'HELP_MORE' to False. EvMORE uses CLIENT_DEFAULT_HEIGHT
 HELP_MORE = True
+# EvMenu stores itself as `caller.ndb._evmenu`. It is also stored as the
+# deprecated `caller.ndb._menutree` for backwards compatibility; set this to
+# False if your game no longer uses the old name.
+EVMENU_LEGACY_MENUTREE_ALIAS = True
 # Set rate limits per-IP on account creations and login attempts
 CREATION_THROTTLE_LIMIT = 2
 CREATION_THROTTLE_TIMEOUT = 10 * 60
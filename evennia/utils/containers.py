@@ -3,13 +3,16 @@ Containers
 
 Containers are storage classes usually initialized from a setting. They
 represent Singletons and acts as a convenient place to find resources (
-available as properties on the singleton)
+available as properties on the singleton). Resources can also be accessed
+dict-style, like `GLOBAL_SCRIPTS["scriptname"]`, which skips the
+attribute-lookup machinery and is preferable in tight loops.
 
 evennia.GLOBAL_SCRIPTS
 evennia.OPTION_CLASSES
 
 """
 
+from types import MappingProxyType
 
 from django.conf import settings
 from evennia.utils.utils import class_from_module, callables_from_module
@@ -29,6 +32,8 @@ class Container(object):
 
     """
 
+    __slots__ = ("loaded_data",)
+
     storage_modules = []
 
     def __init__(self):
@@ -45,11 +50,20 @@ class Container(object):
 
         """
         if self.loaded_data is None:
-            self.loaded_data = {}
+            loaded_data = {}
             for module in self.storage_modules:
-                self.loaded_data.update(callables_from_module(module))
+                loaded_data.update(callables_from_module(module))
+            # the loaded data is read-only
+            self.loaded_data = MappingProxyType(loaded_data)
 
     def __getattr__(self, key):
+        loaded_data = self.loaded_data
+        if loaded_data is not None:
+            # fast path once data is loaded
+            return loaded_data.get(key)
+        return self.get(key)
+
+    def __getitem__(self, key):
         return self.get(key)
 
     def get(self, key, default=None):
@@ -86,6 +100,8 @@ class OptionContainer(Container):
     Can access these as properties or dictionary-contents.
     """
 
+    __slots__ = ()
+
     storage_modules = settings.OPTION_CLASS_MODULES
 
 
@@ -105,6 +121,8 @@ class GlobalScriptContainer(Container):
 
     """
 
+    __slots__ = ("typeclass_storage", "_script_cache")
+
     def __init__(self):
         """
         Note: We must delay loading of typeclasses since this module may get
@@ -112,10 +130,16 @@ class GlobalScriptContainer(Container):
 
         """
         self.typeclass_storage = None
+        # in-memory cache of scripts fetched by key
+        self._script_cache = {}
         self.loaded_data = {
             key: {} if data is None else data for key, data in settings.GLOBAL_SCRIPTS.items()
         }
 
+    def __getattr__(self, key):
+        # loaded_data holds the script settings, so we can't use the fast path
+        return self.get(key)
+
     def _get_scripts(self, key=None, default=None):
         global SCRIPTDB
         if not SCRIPTDB:
@@ -128,17 +152,35 @@ class GlobalScriptContainer(Container):
         else:
             return SCRIPTDB.objects.filter(db_obj__isnull=True)
 
-    def _load_script(self, key):
+    def _load_script(self, key, existing=None):
+        """
+        Load a global script, (re)creating it if it does not exist.
+
+        Args:
+            key (str): The name of the global script.
+            existing (dict, optional): Scripts already fetched from the database,
+                on the form `{(key, typeclass_path): script}`. If given, this is
+                used instead of querying the database for the script.
+
+        Returns:
+            script (Script or None): The loaded script, or `None` if it could
+                not be created.
+
+        """
         self.load_data()
 
         typeclass = self.typeclass_storage[key]
-        found = typeclass.objects.filter(db_key=key).first()
+        if existing is None:
+            found = typeclass.objects.filter(db_key=key).first()
+        else:
+            found = existing.get((key, typeclass.path))
         interval = self.loaded_data[key].get("interval", None)
         start_delay = self.loaded_data[key].get("start_delay", None)
         repeats = self.loaded_data[key].get("repeats", 0)
         desc = self.loaded_data[key].get("desc", "")
 
         if not found:
+            self.invalidate(key)
             logger.log_info(f"GLOBAL_SCRIPTS: (Re)creating {key} ({typeclass}).")
             new_script, errors = typeclass.create(
                 key=key,
@@ -160,6 +202,7 @@ class GlobalScriptContainer(Container):
             or (found.start_delay != start_delay)
             or (found.repeats != repeats)
         ):
+            self.invalidate(key)
             found.restart(interval=interval, start_delay=start_delay, repeats=repeats)
         if found.desc != desc:
             found.desc = desc
@@ -174,12 +217,21 @@ class GlobalScriptContainer(Container):
         make sure to auto-load time-based scripts.
 
         """
+        global SCRIPTDB
+        if not SCRIPTDB:
+            from evennia.scripts.models import ScriptDB as SCRIPTDB
+
         # populate self.typeclass_storage
         self.load_data()
 
+        # fetch all existing global scripts with one query rather than one per script
+        existing = {}
+        for script in SCRIPTDB.objects.filter(db_key__in=list(self.loaded_data)).order_by("id"):
+            existing.setdefault((script.db_key, script.db_typeclass_path), script)
+
         # start registered scripts
         for key in self.loaded_data:
-            self._load_script(key)
+            self._load_script(key, existing=existing)
 
     def load_data(self):
         """
@@ -211,14 +263,38 @@ class GlobalScriptContainer(Container):
 
         Returns:
             any (any): The data loaded on this container.
+
+        Notes:
+            Found scripts are cached in memory, so repeated access does
+            not hit the database. Use `.invalidate()` to clear the cache.
+
         """
-        res = self._get_scripts(key)
-        if not res:
-            if key in self.loaded_data:
+        script = self._script_cache.get(key)
+        if script is None or not script.pk:
+            # not cached, or the cached script was deleted
+            script = self._get_scripts(key)
+            if not script and key in self.loaded_data:
                 # recreate if we have the info
-                return self._load_script(key) or default
-            return default
-        return res
+                script = self._load_script(key)
+            if not script:
+                return default
+            self._script_cache[key] = script
+        return script
+
+    def invalidate(self, key=None):
+        """
+        Clear the in-memory cache of scripts, forcing them to be re-fetched
+        from the database next time they are accessed.
+
+        Args:
+            key (str, optional): The name of the script to clear from the cache.
+                If not given, the entire cache is cleared.
+
+        """
+        if key is None:
+            self._script_cache.clear()
+        else:
+            self._script_cache.pop(key, None)
 
     def all(self):
         """
@@ -167,6 +167,13 @@ EvMenu:
     menutree = evmenu.parse_menu_template(caller, menu_template, goto_callables)
     EvMenu(caller, menutree)
 
+For very large templates, `parse_menu_template_async` does the same but parses
+the template in a thread, returning a Deferred that fires with the menu-tree:
+::
+
+    deferred = evmenu.parse_menu_template_async(caller, menu_template, goto_callables)
+    deferred.addCallback(lambda menutree: EvMenu(caller, menutree))
+
 For maximum flexibility you can inject normally-created nodes in the menu tree
 before passing it to EvMenu. If that's not needed, you can also create a menu
 in one step with:
@@ -263,13 +270,15 @@ import re
 import inspect
 
 from ast import literal_eval
-from fnmatch import fnmatch
+from copy import deepcopy
+from fnmatch import translate as fnmatch_translate
+from functools import lru_cache
 
-from inspect import isfunction, getargspec
+from inspect import isfunction, getfullargspec
+from twisted.internet.threads import deferToThread
 from django.conf import settings
 from evennia import Command, CmdSet
 from evennia.utils import logger
-from evennia.utils.evtable import EvTable
 from evennia.utils.ansi import strip_ansi
 from evennia.utils.utils import mod_import, make_iter, pad, to_str, m_len, is_iter, dedent, crop
 from evennia.commands import cmdhandler
@@ -277,9 +286,15 @@ from evennia.commands import cmdhandler
 # i18n
 from django.utils.translation import gettext as _
 
+# lazy-loaded, only needed by the default options formatter
+_EVTABLE = None
+
 # read from protocol NAWS later?
 _MAX_TEXT_WIDTH = settings.CLIENT_DEFAULT_WIDTH
 
+# option keys/descriptions are usually constants, re-measured on every display
+_cached_m_len = lru_cache(maxsize=4096)(m_len)
+
 # we use cmdhandler instead of evennia.syscmdkeys to
 # avoid some cases of loading before evennia init'd
 _CMD_NOMATCH = cmdhandler.CMD_NOMATCH
@@ -300,6 +315,75 @@ _HELP_NO_OPTIONS = _("Commands: help, quit")
 _HELP_NO_OPTIONS_NO_QUIT = _("Commands: help")
 _HELP_NO_OPTION_MATCH = _("Choose an option or try 'help'.")
 
+# characters that can start ansi markup, escapes or raw ansi codes. Custom
+# color maps can use any markup, so then we always run the full parser.
+_ANSI_MARKUP_CHARS = (
+    None
+    if (
+        settings.COLOR_NO_DEFAULT
+        or settings.COLOR_ANSI_EXTRA_MAP
+        or settings.COLOR_XTERM256_EXTRA_FG
+        or settings.COLOR_XTERM256_EXTRA_BG
+        or settings.COLOR_XTERM256_EXTRA_GFG
+        or settings.COLOR_XTERM256_EXTRA_GBG
+        or settings.COLOR_ANSI_XTERM256_BRIGHT_BG_EXTRA_MAP
+    )
+    else ("|", "{", "\\", "\033")
+)
+
+
+def _maybe_strip_ansi(string):
+    """
+    Strip ansi markup from `string`, but skip the (comparatively slow)
+    ansi parser if the string can't contain any markup.
+
+    Args:
+        string (str): The string to strip.
+
+    Returns:
+        str: The string without ansi markup.
+
+    """
+    if (
+        _ANSI_MARKUP_CHARS
+        and type(string) is str
+        and not any(char in string for char in _ANSI_MARKUP_CHARS)
+    ):
+        return string
+    return strip_ansi(string)
+
+
+# built-in menu commands, mapped to (enabling flag, method) on the EvMenu
+_MENU_COMMANDS = {
+    "look": ("auto_look", "display_nodetext"),
+    "l": ("auto_look", "display_nodetext"),
+    "help": ("auto_help", "display_helptext"),
+    "h": ("auto_help", "display_helptext"),
+    "quit": ("auto_quit", "close_menu"),
+    "q": ("auto_quit", "close_menu"),
+    "exit": ("auto_quit", "close_menu"),
+}
+
+# EvMenu.__init__ kwargs/startnode kwargs that may not be set by the user
+_RESERVED_EVMENU_KWARGS = frozenset(
+    (
+        "_startnode",
+        "_menutree",
+        "_session",
+        "_persistent",
+        "cmd_on_exit",
+        "default",
+        "nodetext",
+        "helptext",
+        "options",
+        "cmdset_mergetype",
+        "auto_quit",
+    )
+)
+_RESERVED_STARTNODE_KWARGS = frozenset(("nodename", "raw_string"))
+# already-normalized cmdset mergetypes
+_MERGETYPES = frozenset(("Union", "Intersect", "Replace", "Remove"))
+
 _ERROR_PERSISTENT_SAVING = """
 {error}
 
@@ -315,6 +399,120 @@ _TRACE_PERSISTENT_SAVING = (
 )
 
 
+# `(nargs, supports_kwargs)` of callables, keyed on their code object
+_CALLBACK_SIGS = {}
+
+
+def _callback_sig(callback):
+    """
+    Introspect a node/goto-callable once and cache the result, since the same
+    callables are called over and over as the user moves through the menu.
+    The cache is keyed on the code object, so it does not keep the callables
+    (or the instance of a bound method) alive and works for unhashable ones.
+    Other callables, like partials, are inspected every time.
+
+    Args:
+        callback (callable): The callable to inspect.
+
+    Returns:
+        tuple: `(nargs, supports_kwargs)` - the number of positional arguments
+            and if the callable accepts `**kwargs`.
+
+    Raises:
+        TypeError: If `callback` cannot be inspected.
+
+    """
+    func = getattr(callback, "__func__", callback)
+    code = func.__code__ if isfunction(func) else None
+    try:
+        return _CALLBACK_SIGS[code]
+    except KeyError:
+        pass
+    spec = getfullargspec(callback)
+    sig = len(spec.args), bool(spec.varkw)
+    if code is not None:
+        _CALLBACK_SIGS[code] = sig
+    return sig
+
+
+@lru_cache(maxsize=256)
+def _cached_dedent(text):
+    return dedent(text.strip("\n"), baseline_index=0).rstrip()
+
+
+def _dedent_text(text):
+    """
+    Dedent and strip node/help text. Node texts are mostly constants, so
+    the result is cached for plain strings (not for ANSIStrings, which compare
+    equal to their un-colored version).
+
+    Args:
+        text (str): The text to dedent.
+
+    Returns:
+        str: The dedented text.
+
+    """
+    if type(text) is str:
+        return _cached_dedent(text)
+    return dedent(text.strip("\n"), baseline_index=0).rstrip()
+
+
+@lru_cache(maxsize=64)
+def _cached_mod_import(menudata):
+    """
+    Import a menu module once, rather than for every menu (re)started from it.
+    Failed imports are not cached.
+
+    Args:
+        menudata (str or module): Python-path or file path to the menu module,
+            or the module itself.
+
+    Returns:
+        module: The imported module.
+
+    Raises:
+        EvMenuError: If the module could not be imported.
+
+    """
+    module = mod_import(menudata)
+    if module is None:
+        raise EvMenuError(f"Could not import menu module '{menudata}'.")
+    return module
+
+
+@lru_cache(maxsize=128)
+def _module_nodemap(module):
+    """
+    Scan a menu module for its node functions. This is cached per module, so
+    re-creating the same menu (such as when restoring persistent menus after a
+    reload) does not re-scan the module.
+
+    Args:
+        module (module): The menu module.
+
+    Returns:
+        dict: A `{nodename: func}` mapping of all public functions in `module`.
+
+    Notes:
+        The nodes are also introspected here, so `EvMenu._safe_call` only
+        finds them in the `_callback_sig` cache later.
+
+    """
+    nodemap = {
+        key: func
+        for key, func in vars(module).items()
+        if not key.startswith("_") and isfunction(func)
+    }
+    for func in nodemap.values():
+        try:
+            _callback_sig(func)
+        except TypeError:
+            # this will be reported if the node is ever called
+            pass
+    return nodemap
+
+
 class EvMenuError(RuntimeError):
     """
     Error raised by menu when facing internal errors.
@@ -361,6 +559,22 @@ class CmdEvMenuNode(Command):
     def func(self):
         """
         Implement all menu commands.
+        """
+        menu = self.caller.ndb._evmenu
+        if menu:
+            # we store Session on the menu since this can be hard to
+            # get in multisession environemtns if caller is an Account.
+            menu._session = self.session
+            menu.parse_input(self.raw_string)
+        else:
+            self._restore_menu()
+
+    def _restore_menu(self):
+        """
+        Called when no menu is stored on the caller. This is the case after a
+        reload (when the menu must be restored from its persistent save), or if
+        the menu is stored on the caller's Account or Session.
+
         """
 
         def _restore(caller):
@@ -368,14 +582,16 @@ class CmdEvMenuNode(Command):
             # this will re-start a completely new evmenu call.
             saved_options = caller.attributes.get("_menutree_saved")
             if saved_options:
+                # if no node was reached yet, we use the startnode stored with the options
                 startnode_tuple = caller.attributes.get("_menutree_saved_startnode")
-                try:
-                    startnode, startnode_input = startnode_tuple
-                except ValueError:  # old form of startnode store
-                    startnode, startnode_input = startnode_tuple, ""
-                if startnode:
-                    saved_options[2]["startnode"] = startnode
-                    saved_options[2]["startnode_input"] = startnode_input
+                if startnode_tuple:
+                    try:
+                        startnode, startnode_input = startnode_tuple
+                    except ValueError:  # old form of startnode store
+                        startnode, startnode_input = startnode_tuple, ""
+                    if startnode:
+                        saved_options[2]["startnode"] = startnode
+                        saved_options[2]["startnode_input"] = startnode_input
                 MenuClass = saved_options[0]
                 # this will create a completely new menu call
                 MenuClass(caller, *saved_options[1], **saved_options[2])
@@ -383,30 +599,26 @@ class CmdEvMenuNode(Command):
             return None
 
         caller = self.caller
-        # we store Session on the menu since this can be hard to
-        # get in multisession environemtns if caller is an Account.
-        menu = caller.ndb._evmenu
+        if _restore(caller):
+            return
+        orig_caller = caller
+        caller = caller.account if hasattr(caller, "account") else None
+        menu = caller.ndb._evmenu if caller else None
         if not menu:
-            if _restore(caller):
+            if caller and _restore(caller):
                 return
-            orig_caller = caller
-            caller = caller.account if hasattr(caller, "account") else None
-            menu = caller.ndb._evmenu if caller else None
+            caller = self.session
+            menu = caller.ndb._evmenu
             if not menu:
-                if caller and _restore(caller):
-                    return
-                caller = self.session
-                menu = caller.ndb._evmenu
-                if not menu:
-                    # can't restore from a session
-                    err = "Menu object not found as %s.ndb._evmenu!" % orig_caller
-                    orig_caller.msg(
-                        err
-                    )  # don't give the session as a kwarg here, direct to original
-                    raise EvMenuError(err)
+                # can't restore from a session
+                err = "Menu object not found as %s.ndb._evmenu!" % orig_caller
+                orig_caller.msg(
+                    err
+                )  # don't give the session as a kwarg here, direct to original
+                raise EvMenuError(err)
         # we must do this after the caller with the menu has been correctly identified since it
         # can be either Account, Object or Session (in the latter case this info will be superfluous).
-        caller.ndb._evmenu._session = self.session
+        menu._session = self.session
         # we have a menu, use it.
         menu.parse_input(self.raw_string)
 
@@ -431,6 +643,24 @@ class EvMenuCmdSet(CmdSet):
         self.add(CmdEvMenuNode())
 
 
+class _CmdOnExitStr:
+    """
+    Callable used as `cmd_on_exit` when this is given as a command string.
+    Unlike a lambda, this can be pickled.
+
+    """
+
+    __slots__ = ("cmd",)
+
+    def __init__(self, cmd):
+        self.cmd = cmd
+
+    def __call__(self, caller, menu):
+        # At this point menu._session will have been replaced by the
+        # menu command to the actual session calling.
+        caller.execute_cmd(self.cmd, session=menu._session)
+
+
 # ------------------------------------------------------------
 #
 # Menu main class
@@ -445,6 +675,32 @@ class EvMenu:
 
     """
 
+    # there is one menu per user in a menu, so keep them small. The `__dict__`
+    # slot allows for storing arbitrary `**kwargs` on the menu.
+    __slots__ = (
+        "caller",
+        "_startnode",
+        "_menutree",
+        "_persistent",
+        "_quitting",
+        "_session",
+        "_format_cache",
+        "auto_quit",
+        "auto_look",
+        "auto_help",
+        "debug_mode",
+        "cmd_on_exit",
+        "default",
+        "nodetext",
+        "helptext",
+        "options",
+        "nodename",
+        "node_kwargs",
+        "test_options",
+        "test_nodetext",
+        "__dict__",
+    )
+
     # convenient helpers for easy overloading
     node_border_char = "_"
 
@@ -514,8 +770,9 @@ class EvMenu:
                 with caution - if your menu is buggy you may end up in a state
                 you can't get out of! Also note that persistent mode requires
                 that all formatters, menu nodes and callables are possible to
-                *pickle*. When the server is reloaded, the latest node shown will be completely
-                re-run with the same input arguments - so be careful if you are counting
+                *pickle* (the menu state is stored in Attributes, which are pickled
+                with protocol 4). When the server is reloaded, the latest node shown will be
+                completely re-run with the same input arguments - so be careful if you are counting
                 up some persistent counter or similar - the counter may be run twice if
                 reload happens on the node that does that. Note that if `debug` is True,
                 this setting is ignored and assumed to be False.
@@ -572,11 +829,7 @@ class EvMenu:
         self.debug_mode = debug
         self._session = session
         if isinstance(cmd_on_exit, str):
-            # At this point menu._session will have been replaced by the
-            # menu command to the actual session calling.
-            self.cmd_on_exit = lambda caller, menu: caller.execute_cmd(
-                cmd_on_exit, session=menu._session
-            )
+            self.cmd_on_exit = _CmdOnExitStr(cmd_on_exit)
         elif callable(cmd_on_exit):
             self.cmd_on_exit = cmd_on_exit
         else:
@@ -588,27 +841,23 @@ class EvMenu:
         self.options = None
         self.nodename = None
         self.node_kwargs = {}
+        # cache formatted nodes, unless formatters are customized
+        cls = type(self)
+        self._format_cache = (
+            {}
+            if (
+                cls.nodetext_formatter is EvMenu.nodetext_formatter
+                and cls.options_formatter is EvMenu.options_formatter
+            )
+            else None
+        )
 
         # used for testing
         self.test_options = {}
         self.test_nodetext = ""
 
         # assign kwargs as initialization vars on ourselves.
-        reserved_clash = set(
-            (
-                "_startnode",
-                "_menutree",
-                "_session",
-                "_persistent",
-                "cmd_on_exit",
-                "default",
-                "nodetext",
-                "helptext",
-                "options",
-                "cmdset_mergetype",
-                "auto_quit",
-            )
-        ).intersection(set(kwargs.keys()))
+        reserved_clash = _RESERVED_EVMENU_KWARGS & kwargs.keys()
         if reserved_clash:
             raise RuntimeError(
                 f"One or more of the EvMenu `**kwargs` ({list(reserved_clash)}) is reserved by EvMenu for internal use."
@@ -627,8 +876,9 @@ class EvMenu:
         # store ourself on the object
         self.caller.ndb._evmenu = self
 
-        # DEPRECATED - for backwards-compatibility
-        self.caller.ndb._menutree = self
+        if settings.EVMENU_LEGACY_MENUTREE_ALIAS:
+            # DEPRECATED - for backwards-compatibility
+            self.caller.ndb._menutree = self
 
         if persistent:
             # save the menu to the database
@@ -641,11 +891,17 @@ class EvMenu:
                 "auto_help": auto_help,
                 "cmd_on_exit": cmd_on_exit,
                 "persistent": persistent,
+                "startnode_input": startnode_input,
             }
             calldict.update(kwargs)
             try:
+                # the current node is saved separately as the menu moves between
+                # nodes (starting with the goto below); until then the startnode
+                # stored here is used.
                 caller.attributes.add("_menutree_saved", (self.__class__, (menudata,), calldict))
-                caller.attributes.add("_menutree_saved_startnode", (startnode, startnode_input))
+                if caller.attributes.has("_menutree_saved_startnode"):
+                    # left over from a menu that was not closed properly
+                    caller.attributes.remove("_menutree_saved_startnode")
             except Exception as err:
                 self.msg(_ERROR_PERSISTENT_SAVING.format(error=err))
                 logger.log_trace(_TRACE_PERSISTENT_SAVING)
@@ -653,17 +909,19 @@ class EvMenu:
 
         # set up the menu command on the caller
         menu_cmdset = EvMenuCmdSet()
-        menu_cmdset.mergetype = str(cmdset_mergetype).lower().capitalize() or "Replace"
+        if cmdset_mergetype in _MERGETYPES:
+            menu_cmdset.mergetype = cmdset_mergetype
+        else:
+            menu_cmdset.mergetype = str(cmdset_mergetype).lower().capitalize() or "Replace"
         menu_cmdset.priority = int(cmdset_priority)
         self.caller.cmdset.add(menu_cmdset, permanent=persistent)
 
-        reserved_startnode_kwargs = set(("nodename", "raw_string"))
         startnode_kwargs = {}
         if isinstance(startnode_input, (tuple, list)) and len(startnode_input) > 1:
             startnode_input, startnode_kwargs = startnode_input[:2]
             if not isinstance(startnode_kwargs, dict):
                 raise EvMenuError("startnode_input must be either a str or a tuple (str, dict).")
-            clashing_kwargs = reserved_startnode_kwargs.intersection(set(startnode_kwargs.keys()))
+            clashing_kwargs = _RESERVED_STARTNODE_KWARGS & startnode_kwargs.keys()
             if clashing_kwargs:
                 raise RuntimeError(
                     f"Evmenu startnode_inputs includes kwargs {tuple(clashing_kwargs)} that "
@@ -694,12 +952,8 @@ class EvMenu:
             return menudata
         else:
             # a python path of a module
-            module = mod_import(menudata)
-            return dict(
-                (key, func)
-                for key, func in module.__dict__.items()
-                if isfunction(func) and not key.startswith("_")
-            )
+            # copy, so the cached map is never mutated through a menu instance
+            return dict(_module_nodemap(_cached_mod_import(menudata)))
 
     def _format_node(self, nodetext, optionlist):
         """
@@ -718,7 +972,27 @@ class EvMenu:
             a maxiumum of 4 rows (expanding in columns), then gradually
             growing to make use of the screen space.
 
+            The formatted node text and options are cached for the current
+            menu, so returning to a node with the same text and options will not
+            re-run the formatters. This is only done for plain-string texts and if
+            `nodetext_formatter` and `options_formatter` are not overridden, since
+            custom formatters may depend on other state.
+
         """
+        cache_key = None
+        if (
+            self._format_cache is not None
+            and type(nodetext) is str
+            and all(
+                type(key) is str and (desc is None or type(desc) is str)
+                for key, desc in optionlist
+            )
+        ):
+            # not for ANSIStrings, which compare equal to their un-colored version
+            cache_key = (nodetext, tuple(optionlist))
+            cached = self._format_cache.get(cache_key)
+            if cached:
+                return self.node_formatter(*cached)
 
         # handle the node text
         nodetext = self.nodetext_formatter(nodetext)
@@ -726,6 +1000,12 @@ class EvMenu:
         # handle the options
         optionstext = self.options_formatter(optionlist)
 
+        if cache_key is not None:
+            if len(self._format_cache) >= 32:
+                # drop the oldest entry
+                del self._format_cache[next(iter(self._format_cache))]
+            self._format_cache[cache_key] = (nodetext, optionstext)
+
         # format the entire node
         return self.node_formatter(nodetext, optionstext)
 
@@ -761,10 +1041,9 @@ class EvMenu:
         """
         try:
             try:
-                nargs = len(getargspec(callback).args)
+                nargs, supports_kwargs = _callback_sig(callback)
             except TypeError:
                 raise EvMenuError("Callable {} doesn't accept any arguments!".format(callback))
-            supports_kwargs = bool(getargspec(callback).keywords)
             if nargs <= 0:
                 raise EvMenuError("Callable {} doesn't accept any arguments!".format(callback))
 
@@ -813,8 +1092,12 @@ class EvMenu:
         try:
             kwargs["_current_nodename"] = nodename
             ret = self._safe_call(node, raw_string, **kwargs)
-            if isinstance(ret, (tuple, list)) and len(ret) > 1:
-                nodetext, options = ret[:2]
+            if isinstance(ret, (tuple, list)):
+                try:
+                    nodetext, options = ret
+                except ValueError:
+                    # too few or too many elements; any extras are ignored
+                    nodetext, options = ret[:2] if len(ret) > 1 else (ret, None)
             else:
                 nodetext, options = ret, None
         except KeyError:
@@ -925,29 +1208,31 @@ class EvMenu:
         goto_kwargs, exec_kwargs = {}, {}
         goto, execute = option_dict.get("goto", None), option_dict.get("exec", None)
         if goto and isinstance(goto, (tuple, list)):
-            if len(goto) > 1:
-                goto, goto_kwargs = goto[:2]  # ignore any extra arguments
-                if not hasattr(goto_kwargs, "__getitem__"):
-                    #  not a dict-like structure
-                    raise EvMenuError(
-                        "EvMenu node {}: goto kwargs is not a dict: {}".format(
-                            nodename, goto_kwargs
-                        )
-                    )
-            else:
-                goto = goto[0]
+            try:
+                goto, goto_kwargs = goto
+            except ValueError:
+                if len(goto) > 1:
+                    goto, goto_kwargs = goto[:2]  # ignore any extra arguments
+                else:
+                    goto = goto[0]
+            if not hasattr(goto_kwargs, "__getitem__"):
+                #  not a dict-like structure
+                raise EvMenuError(
+                    "EvMenu node {}: goto kwargs is not a dict: {}".format(nodename, goto_kwargs)
+                )
         if execute and isinstance(execute, (tuple, list)):
-            if len(execute) > 1:
-                execute, exec_kwargs = execute[:2]  # ignore any extra arguments
-                if not hasattr(exec_kwargs, "__getitem__"):
-                    #  not a dict-like structure
-                    raise EvMenuError(
-                        "EvMenu node {}: exec kwargs is not a dict: {}".format(
-                            nodename, goto_kwargs
-                        )
-                    )
-            else:
-                execute = execute[0]
+            try:
+                execute, exec_kwargs = execute
+            except ValueError:
+                if len(execute) > 1:
+                    execute, exec_kwargs = execute[:2]  # ignore any extra arguments
+                else:
+                    execute = execute[0]
+            if not hasattr(exec_kwargs, "__getitem__"):
+                #  not a dict-like structure
+                raise EvMenuError(
+                    "EvMenu node {}: exec kwargs is not a dict: {}".format(nodename, exec_kwargs)
+                )
         return goto, goto_kwargs, execute, exec_kwargs
 
     def goto(self, nodename, raw_string, **kwargs):
@@ -1009,21 +1294,24 @@ class EvMenu:
         if options:
             for inum, dic in enumerate(options):
                 # fix up the option dicts
-                keys = make_iter(dic.get("key"))
+                keys = dic.get("key")
+                if keys is None:
+                    # no key set, use the running number
+                    keys = [str(inum + 1)]
+                elif isinstance(keys, str):
+                    keys = [keys]
+                elif not isinstance(keys, (list, tuple)):
+                    keys = make_iter(keys)
                 desc = dic.get("desc", dic.get("text", None))
+                goto, goto_kwargs, execute, exec_kwargs = self.extract_goto_exec(nodename, dic)
                 if "_default" in keys:
                     keys = [key for key in keys if key != "_default"]
-                    goto, goto_kwargs, execute, exec_kwargs = self.extract_goto_exec(nodename, dic)
                     self.default = (goto, goto_kwargs, execute, exec_kwargs)
-                else:
-                    # use the key (only) if set, otherwise use the running number
-                    keys = list(make_iter(dic.get("key", str(inum + 1).strip())))
-                    goto, goto_kwargs, execute, exec_kwargs = self.extract_goto_exec(nodename, dic)
                 if keys:
                     display_options.append((keys[0], desc))
                     for key in keys:
                         if goto or execute:
-                            self.options[strip_ansi(key).strip().lower()] = (
+                            self.options[_maybe_strip_ansi(key).strip().lower()] = (
                                 goto,
                                 goto_kwargs,
                                 execute,
@@ -1085,6 +1373,7 @@ class EvMenu:
                 self.cmd_on_exit(self.caller, self)
             # special for template-generated menues
             del self.caller.db._evmenu_template_contents
+            del self.caller.ndb._evmenu_template_contents
 
     def print_debug_info(self, arg):
         """
@@ -1095,50 +1384,63 @@ class EvMenu:
                 of a property to inspect.
 
         """
-        all_props = inspect.getmembers(self)
-        all_methods = [name for name, _ in inspect.getmembers(self, predicate=inspect.ismethod)]
-        all_builtins = [name for name, _ in inspect.getmembers(self, predicate=inspect.isbuiltin)]
-        props = {
-            prop: value
-            for prop, value in all_props
-            if prop not in all_methods and prop not in all_builtins and not prop.endswith("__")
-        }
-
-        local = {
-            key: var
-            for key, var in locals().items()
-            if key not in all_props and not key.endswith("__")
-        }
-
-        if arg:
-            if arg in props:
-                debugtxt = " |y* {}:|n\n{}".format(arg, props[arg])
-            elif arg in local:
-                debugtxt = " |y* {}:|n\n{}".format(arg, local[arg])
-            elif arg == "full":
-                debugtxt = (
-                    "|yMENU DEBUG full ... |n\n"
-                    + "\n".join(
-                        "|y *|n {}: {}".format(key, val) for key, val in sorted(props.items())
-                    )
-                    + "\n |yLOCAL VARS:|n\n"
-                    + "\n".join(
-                        "|y *|n {}: {}".format(key, val) for key, val in sorted(local.items())
-                    )
-                    + "\n |y... END MENU DEBUG|n"
-                )
+        local = {key: var for key, var in locals().items() if not key.endswith("__")}
+
+        if arg and arg != "full":
+            # only look up the single property asked for
+            if not arg.endswith("__"):
+                try:
+                    value = getattr(self, arg)
+                except AttributeError:
+                    pass
+                else:
+                    if not (inspect.ismethod(value) or inspect.isbuiltin(value)):
+                        self.msg(" |y* {}:|n\n{}".format(arg, value))
+                        return
+            if arg in local:
+                self.msg(" |y* {}:|n\n{}".format(arg, local[arg]))
             else:
-                debugtxt = "|yUsage: menudebug full|<name of property>|n"
+                self.msg("|yUsage: menudebug full|<name of property>|n")
+            return
+
+        # instance properties are either in __dict__ or in slots on the classes
+        names = set(getattr(self, "__dict__", ()))
+        for cls in type(self).__mro__:
+            names.update(cls.__dict__)
+        props = {}
+        for name in names:
+            if name.endswith("__"):
+                continue
+            try:
+                value = getattr(self, name)
+            except AttributeError:
+                # an unset slot
+                continue
+            if not (inspect.ismethod(value) or inspect.isbuiltin(value)):
+                props[name] = value
+
+        if arg == "full":
+            debugtxt = (
+                "|yMENU DEBUG full ... |n\n"
+                + "\n".join(
+                    "|y *|n {}: {}".format(key, val) for key, val in sorted(props.items())
+                )
+                + "\n |yLOCAL VARS:|n\n"
+                + "\n".join(
+                    "|y *|n {}: {}".format(key, val) for key, val in sorted(local.items())
+                )
+                + "\n |y... END MENU DEBUG|n"
+            )
         else:
             debugtxt = (
                 "|yMENU DEBUG properties ... |n\n"
                 + "\n".join(
-                    "|y *|n {}: {}".format(key, crop(to_str(val, force_string=True), width=50))
+                    "|y *|n {}: {}".format(key, crop(to_str(val), width=50))
                     for key, val in sorted(props.items())
                 )
                 + "\n |yLOCAL VARS:|n\n"
                 + "\n".join(
-                    "|y *|n {}: {}".format(key, crop(to_str(val, force_string=True), width=50))
+                    "|y *|n {}: {}".format(key, crop(to_str(val), width=50))
                     for key, val in sorted(local.items())
                 )
                 + "\n |y... END MENU DEBUG|n"
@@ -1158,20 +1460,18 @@ class EvMenu:
             should also report errors directly to the user.
 
         """
-        cmd = strip_ansi(raw_string.strip().lower())
+        cmd = _maybe_strip_ansi(raw_string.strip().lower())
+        option = self.options.get(cmd) if self.options else None
+        menu_command = _MENU_COMMANDS.get(cmd)
 
         try:
-            if self.options and cmd in self.options:
+            if option:
                 # this will take precedence over the default commands
                 # below
-                goto, goto_kwargs, execfunc, exec_kwargs = self.options[cmd]
+                goto, goto_kwargs, execfunc, exec_kwargs = option
                 self.run_exec_then_goto(execfunc, goto, raw_string, exec_kwargs, goto_kwargs)
-            elif self.auto_look and cmd in ("look", "l"):
-                self.display_nodetext()
-            elif self.auto_help and cmd in ("help", "h"):
-                self.display_helptext()
-            elif self.auto_quit and cmd in ("quit", "q", "exit"):
-                self.close_menu()
+            elif menu_command and getattr(self, menu_command[0]):
+                getattr(self, menu_command[1])()
             elif self.debug_mode and cmd.startswith("menudebug"):
                 self.print_debug_info(cmd[9:].strip())
             elif self.default:
@@ -1203,7 +1503,7 @@ class EvMenu:
             nodetext (str): The formatted node text.
 
         """
-        return dedent(nodetext.strip("\n"), baseline_index=0).rstrip()
+        return _dedent_text(nodetext)
 
     def helptext_formatter(self, helptext):
         """
@@ -1216,7 +1516,7 @@ class EvMenu:
             helptext (str): The formatted help text.
 
         """
-        return dedent(helptext.strip("\n"), baseline_index=0).rstrip()
+        return _dedent_text(helptext)
 
     def options_formatter(self, optionlist):
         """
@@ -1231,33 +1531,40 @@ class EvMenu:
             options (str): The formatted option display.
 
         """
+        global _EVTABLE
         if not optionlist:
             return ""
+        if not _EVTABLE:
+            from evennia.utils.evtable import EvTable as _EVTABLE
 
         # column separation distance
         colsep = 4
 
         nlist = len(optionlist)
 
-        # get the widest option line in the table.
+        def _width(string):
+            # widest line of a (possibly multi-line) string
+            if "\n" in string:
+                return max(_cached_m_len(part) for part in string.split("\n"))
+            return _cached_m_len(string)
+
+        # get the widest option line in the table, remembering the width of each entry
         table_width_max = -1
         table = []
+        widths = []
         for key, desc in optionlist:
             if key or desc:
                 desc_string = ": %s" % desc if desc else ""
-                table_width_max = max(
-                    table_width_max,
-                    max(m_len(p) for p in key.split("\n"))
-                    + max(m_len(p) for p in desc_string.split("\n"))
-                    + colsep,
-                )
-                raw_key = strip_ansi(key)
+                table_width_max = max(table_width_max, _width(key) + _width(desc_string) + colsep)
+                raw_key = _maybe_strip_ansi(key)
                 if raw_key != key:
                     # already decorations in key definition
-                    table.append(" |lc%s|lt%s|le%s" % (raw_key, key, desc_string))
+                    entry = " |lc%s|lt%s|le%s" % (raw_key, key, desc_string)
                 else:
                     # add a default white color to key
-                    table.append(" |lc%s|lt|w%s|n|le%s" % (raw_key, raw_key, desc_string))
+                    entry = " |lc%s|lt|w%s|n|le%s" % (raw_key, raw_key, desc_string)
+                table.append(entry)
+                widths.append(_width(entry))
         ncols = _MAX_TEXT_WIDTH // table_width_max  # number of ncols
 
         if ncols < 0:
@@ -1265,10 +1572,8 @@ class EvMenu:
             return ""
 
         ncols = ncols + 1 if ncols == 0 else ncols
-        # get the amount of rows needed (start with 4 rows)
-        nrows = 4
-        while nrows * ncols < nlist:
-            nrows += 1
+        # get the amount of rows needed (at least 4 rows)
+        nrows = max(4, (nlist + ncols - 1) // ncols)
         ncols = nlist // nrows  # number of full columns
         nlastcol = nlist % nrows  # number of elements in last column
 
@@ -1277,19 +1582,18 @@ class EvMenu:
         if ncols > 1:
             # only extend if longer than one column
             table.extend([" " for i in range(nrows - nlastcol)])
+            widths.extend([1 for i in range(nrows - nlastcol)])
 
-        # build the actual table grid
-        table = [table[icol * nrows : (icol * nrows) + nrows] for icol in range(0, ncols)]
-
-        # adjust the width of each column
-        for icol in range(len(table)):
-            col_width = (
-                max(max(m_len(p) for p in part.split("\n")) for part in table[icol]) + colsep
-            )
-            table[icol] = [pad(part, width=col_width + colsep, align="l") for part in table[icol]]
+        # build the actual table grid, padding each column to its widest entry
+        grid = []
+        for icol in range(0, ncols):
+            column = table[icol * nrows : (icol * nrows) + nrows]
+            col_width = max(widths[icol * nrows : (icol * nrows) + nrows]) + colsep
+            grid.append([pad(part, width=col_width + colsep, align="l") for part in column])
+        table = grid
 
         # format the table into columns
-        return str(EvTable(table=table, border="none"))
+        return str(_EVTABLE(table=table, border="none"))
 
     def node_formatter(self, nodetext, optionstext):
         """
@@ -1311,8 +1615,8 @@ class EvMenu:
         else:
             screen_width = _MAX_TEXT_WIDTH
 
-        nodetext_width_max = max(m_len(line) for line in nodetext.split("\n"))
-        options_width_max = max(m_len(line) for line in optionstext.split("\n"))
+        nodetext_width_max = max(_cached_m_len(line) for line in nodetext.split("\n"))
+        options_width_max = max(_cached_m_len(line) for line in optionstext.split("\n"))
         total_width = min(screen_width, max(options_width_max, nodetext_width_max))
         separator1 = sep * total_width + "\n\n" if nodetext_width_max else ""
         separator2 = "\n" + sep * total_width + "\n\n" if total_width else ""
@@ -1381,7 +1685,7 @@ def list_node(option_generator, select=None, pagesize=10):
             else:
                 if callable(select):
                     try:
-                        if bool(getargspec(select).keywords):
+                        if _callback_sig(select)[1]:
                             return select(caller, selection, available_choices=available_choices)
                         else:
                             return select(caller, selection)
@@ -1408,25 +1712,20 @@ def list_node(option_generator, select=None, pagesize=10):
 
             if option_list:
                 nall_options = len(option_list)
-                pages = [
-                    option_list[ind : ind + pagesize] for ind in range(0, nall_options, pagesize)
-                ]
-                npages = len(pages)
+                npages = (nall_options + pagesize - 1) // pagesize
 
+                # only slice out the page we are going to show
                 page_index = max(0, min(npages - 1, kwargs.get("optionpage_index", 0)))
-                page = pages[page_index]
+                page = option_list[page_index * pagesize : (page_index + 1) * pagesize]
 
             text = ""
-            extra_text = None
 
             # dynamic, multi-page option list. Each selection leads to the `select`
-            # callback being called with a result from the available choices
-            options.extend(
-                [
-                    {"desc": opt, "goto": (_select_parser, {"available_choices": page})}
-                    for opt in page
-                ]
-            )
+            # callback being called with a result from the available choices. The
+            # kwargs are only read by the goto-callables, so they can be shared.
+            choice_kwargs = {"available_choices": page}
+            select_goto = (_select_parser, choice_kwargs)
+            options.extend({"desc": opt, "goto": select_goto} for opt in page)
 
             if npages > 1:
                 # if the goto callable returns None, the same node is rerun, and
@@ -1457,7 +1756,7 @@ def list_node(option_generator, select=None, pagesize=10):
             # add data from the decorated node
 
             decorated_options = []
-            supports_kwargs = bool(getargspec(func).keywords)
+            supports_kwargs = _callback_sig(func)[1]
             try:
                 if supports_kwargs:
                     text, decorated_options = func(caller, raw_string, **kwargs)
@@ -1475,37 +1774,31 @@ def list_node(option_generator, select=None, pagesize=10):
                 logger.log_trace()
             else:
                 if isinstance(decorated_options, dict):
-                    decorated_options = [decorated_options]
+                    decorated_options = (decorated_options,)
                 else:
                     decorated_options = make_iter(decorated_options)
 
-            extra_options = []
-            if isinstance(decorated_options, dict):
-                decorated_options = [decorated_options]
             for eopt in decorated_options:
                 cback = ("goto" in eopt and "goto") or ("exec" in eopt and "exec") or None
                 if cback:
                     signature = eopt[cback]
                     if callable(signature):
                         # callable with no kwargs defined
-                        eopt[cback] = (signature, {"available_choices": page})
+                        eopt[cback] = (signature, choice_kwargs)
                     elif is_iter(signature):
                         if len(signature) > 1 and isinstance(signature[1], dict):
                             signature[1]["available_choices"] = page
                             eopt[cback] = signature
                         elif signature:
                             # a callable alone in a tuple (i.e. no previous kwargs)
-                            eopt[cback] = (signature[0], {"available_choices": page})
+                            eopt[cback] = (signature[0], choice_kwargs)
                         else:
                             # malformed input.
                             logger.log_err(
                                 "EvMenu @list_node decorator found "
                                 "malformed option to decorate: {}".format(eopt)
                             )
-                extra_options.append(eopt)
-
-            options.extend(extra_options)
-            text = text + "\n\n" + extra_text if extra_text else text
+                options.append(eopt)
 
             return text, options
 
@@ -1537,15 +1830,12 @@ class CmdGetInput(Command):
             if not getinput and hasattr(caller, "account"):
                 getinput = caller.account.ndb._getinput
                 caller = caller.account
-            callback = getinput._callback
-
-            caller.ndb._getinput._session = self.session
-            prompt = caller.ndb._getinput._prompt
-            args = caller.ndb._getinput._args
-            kwargs = caller.ndb._getinput._kwargs
+            getinput._session = self.session
             result = self.raw_string.rstrip()  # we strip the ending line break caused by sending
 
-            ok = not callback(caller, prompt, result, *args, **kwargs)
+            ok = not getinput._callback(
+                caller, getinput._prompt, result, *getinput._args, **getinput._kwargs
+            )
             if ok:
                 # only clear the state if the callback does not return
                 # anything
@@ -1576,9 +1866,9 @@ class InputCmdSet(CmdSet):
 
 
 class _Prompt(object):
-    """Dummy holder"""
+    """Holds the state of a running `get_input` prompt"""
 
-    pass
+    __slots__ = ("_callback", "_prompt", "_session", "_args", "_kwargs")
 
 
 def get_input(caller, prompt, callback, session=None, *args, **kwargs):
@@ -1641,12 +1931,13 @@ def get_input(caller, prompt, callback, session=None, *args, **kwargs):
     """
     if not callable(callback):
         raise RuntimeError("get_input: input callback is not callable.")
-    caller.ndb._getinput = _Prompt()
-    caller.ndb._getinput._callback = callback
-    caller.ndb._getinput._prompt = prompt
-    caller.ndb._getinput._session = session
-    caller.ndb._getinput._args = args
-    caller.ndb._getinput._kwargs = kwargs
+    getinput = _Prompt()
+    getinput._callback = callback
+    getinput._prompt = prompt
+    getinput._session = session
+    getinput._args = args
+    getinput._kwargs = kwargs
+    caller.ndb._getinput = getinput
     caller.cmdset.add(InputCmdSet)
     caller.msg(prompt, session=session)
 
@@ -1659,8 +1950,6 @@ def get_input(caller, prompt, callback, session=None, *args, **kwargs):
 
 _RE_NODE = re.compile(r"##\s*?NODE\s+?(?P<nodename>\S[\S\s]*?)$", re.I + re.M)
 _RE_OPTIONS_SEP = re.compile(r"##\s*?OPTIONS\s*?$", re.I + re.M)
-_RE_CALLABLE = re.compile(r"\S+?\(\)", re.I + re.M)
-_RE_CALLABLE = re.compile(r"(?P<funcname>\S+?)(?:\((?P<kwargs>[\S\s]+?)\)|\(\))", re.I + re.M)
 
 _HELP_NO_OPTION_MATCH = _("Choose an option or try 'help'.")
 
@@ -1675,45 +1964,155 @@ _OPTION_COMMENT_START = "#"
 # nodes read from the menu template.
 
 
+def _scan_callable(goto):
+    """
+    Split a goto-callable on the form `funcname(key=value, ...)` into its
+    parts. This walks the string once, so commas and parentheses inside quotes
+    or brackets do not end an argument.
+
+    Args:
+        goto (str): The right-hand-side of a template option.
+
+    Returns:
+        tuple or None: `(funcname, args)`, where `args` is a list of the
+            comma-separated argument strings (empty for `funcname()`). `None` if
+            `goto` is not on callable form.
+
+    """
+    start = goto.find("(")
+    if start < 1 or any(char.isspace() for char in goto[:start]):
+        return None
+    args = []
+    depth = 0
+    quote = None
+    argstart = start + 1
+    ind = argstart
+    length = len(goto)
+    while ind < length:
+        char = goto[ind]
+        if quote:
+            if char == "\\":
+                # skip the escaped character
+                ind += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}" and depth:
+            depth -= 1
+        elif char == ")":
+            if ind > argstart or args:
+                args.append(goto[argstart:ind])
+            return goto[:start], args
+        elif char == "," and not depth:
+            args.append(goto[argstart:ind])
+            argstart = ind + 1
+        ind += 1
+    # no closing parenthesis
+    return None
+
+
+_NAMED_CONSTANTS = {"True": True, "False": False, "None": None}
+
+
+def _eval_kwarg(string):
+    """
+    Evaluate the key or value of a goto-callable kwarg as a Python literal.
+    Plain names and integers are the most common and are converted directly,
+    without going through `literal_eval`.
+
+    Args:
+        string (str): The stripped key or value.
+
+    Returns:
+        any: The evaluated literal, or `string` itself if it's not a literal.
+
+    """
+    if string.isidentifier():
+        return _NAMED_CONSTANTS.get(string, string)
+    if string.isdecimal() and string.isascii() and (string[0] != "0" or string == "0"):
+        return int(string)
+    try:
+        return literal_eval(string)
+    except (ValueError, SyntaxError):
+        return string
+
+
+# kwargs used internally by the templating system, not allowed in goto-callables
+_RESERVED_TEMPLATE_KWARGS = frozenset(
+    (
+        "evmenu_goto",
+        "evmenu_gotomap",
+        "_current_nodename",
+        "evmenu_current_nodename",
+        "evmenu_goto_callables",
+    )
+)
+
+
+@lru_cache(maxsize=1024)
+def _parse_callable(goto):
+    """
+    Parse and validate a goto-callable (`funcname(**kwargs)`) from the
+    right-hand-side of a template option, running literal-eval on its kwargs.
+    This is done when the template is parsed, the cached result is then reused
+    every time the option is used.
+
+    Args:
+        goto (str): The right-hand-side of a template option.
+
+    Returns:
+        tuple or None: `(funcname, kwargs)`, where `kwargs` is a tuple of
+            `(key, value)` pairs. `None` if `goto` is not a callable.
+
+    Raises:
+        RuntimeError: If the callable has non-keyword or reserved arguments.
+
+    """
+    scanned = _scan_callable(goto)
+    if not scanned:
+        return None
+    gotofunc, gotokwargs = scanned
+    kwargs = []
+    for kwarg in gotokwargs:
+        if "=" not in kwarg:
+            raise RuntimeError(
+                f"EvMenu template error: goto-callable '{goto}' has a "
+                f"non-kwarg argument ({kwarg}). All callables in the "
+                "template must have only keyword-arguments, or no "
+                "args at all."
+            )
+        key, value = [part.strip() for part in kwarg.split("=", 1)]
+        if key in _RESERVED_TEMPLATE_KWARGS:
+            raise RuntimeError(
+                f"EvMenu template error: goto-callable '{goto}' uses a "
+                f"kwarg ({kwarg}) that is reserved for the EvMenu templating "
+                "system. Rename the kwarg."
+            )
+        kwargs.append((_eval_kwarg(key), _eval_kwarg(value)))
+    return gotofunc, tuple(kwargs)
+
+
+# kwarg values that can be shared between calls of a goto-callable
+_IMMUTABLE_TYPES = (str, int, float, complex, bool, bytes, type(None))
+
+
 def _process_callable(caller, goto, goto_callables, raw_string, current_nodename, kwargs):
     """
-    Central helper for parsing a goto-callable (`funcname(**kwargs)`) out of
-    the right-hand-side of the template options and map this to an actual
-    callable registered with the template generator. This involves parsing the
-    func-name and running literal-eval on its kwargs.
-
-    """
-    match = _RE_CALLABLE.match(goto)
-    if match:
-        gotofunc = match.group("funcname")
-        gotokwargs = match.group("kwargs") or ""
-        if gotofunc in goto_callables:
-            for kwarg in gotokwargs.split(","):
-                if kwarg and "=" in kwarg:
-                    key, value = [part.strip() for part in kwarg.split("=", 1)]
-                    if key in (
-                        "evmenu_goto",
-                        "evmenu_gotomap",
-                        "_current_nodename",
-                        "evmenu_current_nodename",
-                        "evmenu_goto_callables",
-                    ):
-                        raise RuntimeError(
-                            f"EvMenu template error: goto-callable '{goto}' uses a "
-                            f"kwarg ({kwarg}) that is reserved for the EvMenu templating "
-                            "system. Rename the kwarg."
-                        )
-                    try:
-                        key = literal_eval(key)
-                    except ValueError:
-                        pass
-                    try:
-                        value = literal_eval(value)
-                    except ValueError:
-                        pass
-                    kwargs[key] = value
+    Central helper for mapping a goto-callable (`funcname(**kwargs)`) from the
+    right-hand-side of the template options to an actual callable registered
+    with the template generator, and calling it.
 
-                goto = goto_callables[gotofunc](caller, raw_string, **kwargs)
+    """
+    call = _parse_callable(goto)
+    if call and call[0] in goto_callables:
+        gotofunc, gotokwargs = call
+        for key, value in gotokwargs:
+            # the parsed values are shared, don't let the callable change them
+            kwargs[key] = value if type(value) in _IMMUTABLE_TYPES else deepcopy(value)
+        goto = goto_callables[gotofunc](caller, raw_string, **kwargs)
     if goto is None:
         return goto, {"generated_nodename": current_nodename}
     return goto, {"generated_nodename": goto}
@@ -1732,6 +2131,189 @@ def _generated_goto_func(caller, raw_string, **kwargs):
     return _process_callable(caller, goto, goto_callables, raw_string, current_nodename, kwargs)
 
 
+def _compile_glob(pattern):
+    """
+    Compile a glob pattern into a cheap matcher. Globs that are plain strings,
+    or only have a `*` at the start or end, are common in templates and are
+    matched with string methods instead of a regex.
+
+    Args:
+        pattern (str): The glob pattern.
+
+    Returns:
+        tuple: A `(kind, arg)` matcher for use with `_match_glob`.
+
+    """
+    stem = pattern.strip("*")
+    if any(char in stem for char in "*?["):
+        return ("regex", re.compile(fnmatch_translate(pattern)))
+    if not stem:
+        return ("any", None) if pattern else ("equals", pattern)
+    if pattern.endswith("*"):
+        if pattern.startswith("*"):
+            return ("contains", stem)
+        return ("startswith", stem)
+    if pattern.startswith("*"):
+        return ("endswith", stem)
+    return ("equals", stem)
+
+
+def _match_glob(glob, string):
+    """
+    Match a string against a matcher from `_compile_glob`.
+
+    Args:
+        glob (tuple): The `(kind, arg)` matcher.
+        string (str): The string to match.
+
+    Returns:
+        bool: If the string matches.
+
+    """
+    kind, arg = glob
+    if kind == "startswith":
+        return string.startswith(arg)
+    if kind == "equals":
+        return string == arg
+    if kind == "endswith":
+        return string.endswith(arg)
+    if kind == "contains":
+        return arg in string
+    if kind == "any":
+        return True
+    return arg.match(string) is not None
+
+
+def _order_globs(globs, matchers):
+    """
+    Order the glob patterns of the `>`-type options for the union. Exact-match
+    patterns are moved to the front where no earlier pattern could match the
+    same input, and patterns after a catch-all `*` are dropped, since they can
+    never match. Neither changes which option matches first.
+
+    Args:
+        globs (list): The (lower-case) glob pattern of every option.
+        matchers (list): The patterns compiled with `_compile_glob`, `None`
+            for invalid ones.
+
+    Returns:
+        tuple: `(ordered, catchall)`, where `ordered` is a list of `(index, glob)`
+            and `catchall` is `True` if there is a catch-all glob, so no
+            regex could ever be reached.
+
+    """
+    if None in matchers:
+        # can't be combined into a union anyway
+        return list(enumerate(globs)), False
+    literals, others = [], []
+    for ind, (pattern, matcher) in enumerate(zip(globs, matchers)):
+        kind = matcher[0]
+        if kind == "any":
+            others.append((ind, pattern))
+            return literals + others, True
+        if kind == "equals" and not any(
+            re.match(fnmatch_translate(other), pattern) for _, other in others
+        ):
+            literals.append((ind, pattern))
+        else:
+            others.append((ind, pattern))
+    return literals + others, False
+
+
+def _compile_pattern_union(globs, regexes):
+    """
+    Combine the patterns of the `>`-type options into a single regex, with one
+    group per pattern. All the globs come first, followed by the regexes, if these
+    can be combined without changing what they match. The input is matched
+    lower-cased, so the globs are matched case-sensitively and the regexes ignore
+    case, just like when trying them one by one. Since the alternatives are tried
+    in order, one match finds the same option as trying every glob and then every
+    regex in turn.
+
+    Args:
+        globs (list): `(index, glob)` for the (lower-case) glob pattern of the
+            options, in the order to try them.
+        regexes (list): `(index, regex)` for the compiled regex of the options,
+            where `regex` is `None` if the pattern can't be used as a regex.
+
+    Returns:
+        tuple or None: `(regex, owners, complete)`, where `owners[match.lastindex]`
+            is the index of the option that matched. If `complete` is `False`, the
+            regexes are not included and must be tried separately. `None` if
+            the globs could not be combined into one regex.
+
+    """
+    parts = []
+    owners = [None]
+
+    def _add(ind, pattern, ngroups):
+        # the option's own group closes last, so it's the match' lastindex
+        owners.append(ind)
+        owners.extend([None] * ngroups)
+        parts.append("(%s)" % pattern)
+
+    try:
+        for ind, pattern in globs:
+            translated = fnmatch_translate(pattern)
+            # `re.I` would let e.g. `[--^]` match `b`, which the glob itself doesn't
+            _add(ind, "(?-i:%s)" % translated, re.compile(translated).groups)
+        union = re.compile("|".join(parts), re.I), tuple(owners), False
+    except re.error:
+        # e.g. a bad character range or clashing group names in the translations
+        return None
+
+    # group numbers would shift in the union and global inline flags (like
+    # `(?x)`) would apply to all of it, so only plain regexes are included
+    if all(
+        regex is None or (not regex.groups and not regex.flags & ~(re.I | re.M | re.U))
+        for _, regex in regexes
+    ):
+        for ind, regex in regexes:
+            if regex:
+                _add(ind, regex.pattern, 0)
+        try:
+            return re.compile("|".join(parts), re.I + re.M), tuple(owners), True
+        except re.error:
+            pass
+    return union
+
+
+def _compile_gotomap(inputparsemap):
+    """
+    Pre-compile the patterns of the `>`-type template options, so this does not
+    have to be done every time the user enters something.
+
+    Args:
+        inputparsemap (dict): Mapping `{pattern: goto}`.
+
+    Returns:
+        tuple: `(union, entries)`. `entries` is a tuple of `(glob, regex, goto)`,
+            where `glob` is the pattern compiled with `_compile_glob` and `regex`
+            the pattern compiled as a regular expression. The latter is `None` if
+            the pattern is empty or not a valid regex. `union` is all reachable
+            patterns ordered by `_order_globs` and combined by `_compile_pattern_union`.
+
+    """
+    entries = []
+    for pattern, goto in inputparsemap.items():
+        try:
+            glob = _compile_glob(pattern.lower())
+        except re.error:
+            # not a valid glob, can only match as a regex
+            glob = None
+        try:
+            regex = re.compile(pattern, re.I + re.M) if pattern else None
+        except re.error:
+            # not a valid regex, so it can only match as a glob
+            regex = None
+        entries.append((glob, regex, goto))
+    globs, catchall = _order_globs(
+        [pattern.lower() for pattern in inputparsemap], [glob for glob, _, _ in entries]
+    )
+    regexes = [] if catchall else [(ind, entry[1]) for ind, entry in enumerate(entries)]
+    return _compile_pattern_union(globs, regexes), tuple(entries)
+
+
 def _generated_input_goto_func(caller, raw_string, **kwargs):
     """
     This goto-func acts as a rerouter for >-type line parsing (by acting as the
@@ -1742,19 +2324,36 @@ def _generated_input_goto_func(caller, raw_string, **kwargs):
 
     """
     gotomap = kwargs["evmenu_gotomap"]
+    if not isinstance(gotomap, tuple) or len(gotomap) != 2:
+        # a `{pattern: goto}` map stored by an older version of the template system
+        gotomap = _compile_gotomap(gotomap)
+    union, gotomap = gotomap
     goto_callables = kwargs["evmenu_goto_callables"]
     current_nodename = kwargs["evmenu_current_nodename"]
     raw_string = raw_string.strip("\n")  # strip is necessary to catch empty return
 
-    # start with glob patterns
-    for pattern, goto in gotomap.items():
-        if fnmatch(raw_string.lower(), pattern):
+    cmd = raw_string.lower()
+    if union:
+        # all globs, and usually the regexes too, in one go
+        regex, owners, complete = union
+        match = regex.match(cmd)
+        if match:
+            goto = gotomap[owners[match.lastindex]][2]
             return _process_callable(
                 caller, goto, goto_callables, raw_string, current_nodename, kwargs
             )
+        if complete:
+            raise EvMenuGotoAbortMessage(_HELP_NO_OPTION_MATCH)
+    if not union:
+        # start with glob patterns
+        for glob, _, goto in gotomap:
+            if glob and _match_glob(glob, cmd):
+                return _process_callable(
+                    caller, goto, goto_callables, raw_string, current_nodename, kwargs
+                )
     # no glob pattern match; try regex
-    for pattern, goto in gotomap.items():
-        if pattern and re.match(pattern, raw_string.lower(), flags=re.I + re.M):
+    for _, regex, goto in gotomap:
+        if regex and regex.match(cmd):
             return _process_callable(
                 caller, goto, goto_callables, raw_string, current_nodename, kwargs
             )
@@ -1769,10 +2368,185 @@ def _generated_node(caller, raw_string, **kwargs):
     otherwise we could not make the templated-menu persistent.
 
     """
-    text, options = caller.db._evmenu_template_contents[kwargs["_current_nodename"]]
+    contents = caller.ndb._evmenu_template_contents
+    if contents is None:
+        # not parsed since the last reload; load the stored contents only once
+        contents = caller.ndb._evmenu_template_contents = caller.db._evmenu_template_contents
+    text, options = contents[kwargs["_current_nodename"]]
     return text, options
 
 
+def _parse_options(optiontxt):
+    """
+    Parse option section of a node into option data. This does not depend on
+    the caller or the goto-callables used, so the result can be shared.
+
+    Args:
+        optiontxt (list): The text after the options-separator, if any.
+
+    Returns:
+        tuple: `(options, gotomap)`, where `options` is a tuple of
+            `(keys, desc, goto)` for every regular option and `gotomap` the
+            pre-compiled `>`-type options as returned from `_compile_gotomap`,
+            or `None` if there are no such options.
+
+    """
+    options = []
+    optiontxt = optiontxt[0].strip() if optiontxt else ""
+    inputparsemap = {}
+
+    for inum, optline in enumerate(optiontxt.split("\n")):
+        if _OPTION_SEP_MARKER not in optline:
+            # skip invalid syntax (and empty lines) before spending time on the line
+            continue
+        optline = optline.strip()
+        if optline.startswith(_OPTION_COMMENT_START):
+            # skip comments
+            continue
+        key = ""
+        desc = ""
+        pattern = None
+
+        key, goto = [part.strip() for part in optline.split(_OPTION_SEP_MARKER, 1)]
+
+        # desc -> goto
+        if _OPTION_CALL_MARKER in goto:
+            desc, goto = [part.strip() for part in goto.split(_OPTION_CALL_MARKER, 1)]
+
+        # validate callable
+        _parse_callable(goto)
+
+        # parse key [;aliases|pattern]
+        key = [part.strip() for part in key.split(_OPTION_ALIAS_MARKER)]
+        if not key:
+            # fall back to this being the Nth option
+            key = [f"{inum + 1}"]
+        main_key = key[0]
+
+        if main_key.startswith(_OPTION_INPUT_MARKER):
+            # if we have a pattern, build the arguments for _default later
+            pattern = main_key[len(_OPTION_INPUT_MARKER) :].strip()
+            inputparsemap[pattern] = goto
+        else:
+            # a regular goto string/callable target
+            options.append((tuple(key), desc, goto))
+
+    return tuple(options), _compile_gotomap(inputparsemap) if inputparsemap else None
+
+
+@lru_cache(maxsize=64)
+def _parse_template(menu_template):
+    """
+    Parse the menu string format into its nodes. Menu templates are usually
+    module-level constants, so this is cached to only parse each template once.
+
+    Args:
+        menu_template (str): Menu described using the templating format.
+
+    Returns:
+        tuple: A tuple `((nodename, text, options, gotomap), ...)` for
+            every node, with `options` and `gotomap` as returned from
+            `_parse_options`.
+
+    Raises:
+        RuntimeError: If the template has errors.
+
+    """
+    nodes = []
+    splits = _RE_NODE.split(menu_template)
+    splits = splits[1:] if splits else []
+
+    for node_ind in range(0, len(splits), 2):
+        nodename, nodetxt = splits[node_ind], splits[node_ind + 1]
+        text, *optiontxt = _RE_OPTIONS_SEP.split(nodetxt, maxsplit=2)
+        nodes.append((nodename, text, *_parse_options(optiontxt)))
+    return tuple(nodes)
+
+
+class _TemplateOption:
+    """
+    A menu option generated from a template. EvMenu only reads options with
+    `option.get(...)`, so instead of a dict this is a small slotted record
+    supporting the same read-only access. Since it's not a dict, it is also
+    stored as-is in the caller's Attribute, and not wrapped as a mutable
+    `_SaverDict` when loaded back.
+
+    """
+
+    __slots__ = ("key", "desc", "goto")
+
+    def __init__(self, key, goto, desc=None):
+        self.key = key
+        self.goto = goto
+        self.desc = desc
+
+    def get(self, key, default=None):
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+
+def _build_options(nodename, options, gotomap, goto_callables):
+    """
+    Build the EvMenu options for a node from its parsed options.
+
+    Args:
+        nodename (str): The node the options belong to.
+        options (tuple): Parsed `(keys, desc, goto)` options.
+        gotomap (tuple): Pre-compiled `>`-type options.
+        goto_callables (dict): The goto-callables available to the menu.
+
+    Returns:
+        list: The options, as `_TemplateOption`s.
+
+    """
+    optionlist = []
+    for keys, desc, goto in options:
+        optionlist.append(
+            _TemplateOption(
+                list(keys),
+                (
+                    _generated_goto_func,
+                    {
+                        "evmenu_goto": goto,
+                        "evmenu_current_nodename": nodename,
+                        "evmenu_goto_callables": goto_callables,
+                    },
+                ),
+                desc=desc or None,
+            )
+        )
+
+    if gotomap:
+        # if this exists we must create a _default entry too
+        optionlist.append(
+            _TemplateOption(
+                "_default",
+                (
+                    _generated_input_goto_func,
+                    {
+                        "evmenu_gotomap": gotomap,
+                        "evmenu_current_nodename": nodename,
+                        "evmenu_goto_callables": goto_callables,
+                    },
+                ),
+            )
+        )
+
+    return optionlist
+
+
 def parse_menu_template(caller, menu_template, goto_callables=None):
     """
     Parse menu-template string. The main function of the EvMenu templating system.
@@ -1788,130 +2562,63 @@ def parse_menu_template(caller, menu_template, goto_callables=None):
         dict: A `{"node": nodefunc}` menutree suitable to pass into EvMenu.
 
     """
+    return _build_menutree(_parse_template(menu_template), caller, goto_callables)
 
-    def _validate_kwarg(goto, kwarg):
-        """
-        Validate goto-callable kwarg is on correct form.
-        """
-        if not "=" in kwarg:
-            raise RuntimeError(
-                f"EvMenu template error: goto-callable '{goto}' has a "
-                f"non-kwarg argument ({kwarg}). All callables in the "
-                "template must have only keyword-arguments, or no "
-                "args at all."
-            )
-        key, _ = [part.strip() for part in kwarg.split("=", 1)]
-        if key in (
-            "evmenu_goto",
-            "evmenu_gotomap",
-            "_current_nodename",
-            "evmenu_current_nodename",
-            "evmenu_goto_callables",
-        ):
-            raise RuntimeError(
-                f"EvMenu template error: goto-callable '{goto}' uses a "
-                f"kwarg ({kwarg}) that is reserved for the EvMenu templating "
-                "system. Rename the kwarg."
-            )
 
-    def _parse_options(nodename, optiontxt, goto_callables):
-        """
-        Parse option section into option dict.
-        """
-        options = []
-        optiontxt = optiontxt[0].strip() if optiontxt else ""
-        optionlist = [optline.strip() for optline in optiontxt.split("\n")]
-        inputparsemap = {}
-
-        for inum, optline in enumerate(optionlist):
-            if optline.startswith(_OPTION_COMMENT_START) or _OPTION_SEP_MARKER not in optline:
-                # skip comments or invalid syntax
-                continue
-            key = ""
-            desc = ""
-            pattern = None
-
-            key, goto = [part.strip() for part in optline.split(_OPTION_SEP_MARKER, 1)]
-
-            # desc -> goto
-            if _OPTION_CALL_MARKER in goto:
-                desc, goto = [part.strip() for part in goto.split(_OPTION_CALL_MARKER, 1)]
-
-            # validate callable
-            match = _RE_CALLABLE.match(goto)
-            if match:
-                kwargs = match.group("kwargs")
-                if kwargs:
-                    for kwarg in kwargs.split(","):
-                        _validate_kwarg(goto, kwarg)
-
-            # parse key [;aliases|pattern]
-            key = [part.strip() for part in key.split(_OPTION_ALIAS_MARKER)]
-            if not key:
-                # fall back to this being the Nth option
-                key = [f"{inum + 1}"]
-            main_key = key[0]
-
-            if main_key.startswith(_OPTION_INPUT_MARKER):
-                # if we have a pattern, build the arguments for _default later
-                pattern = main_key[len(_OPTION_INPUT_MARKER) :].strip()
-                inputparsemap[pattern] = goto
-            else:
-                # a regular goto string/callable target
-                option = {
-                    "key": key,
-                    "goto": (
-                        _generated_goto_func,
-                        {
-                            "evmenu_goto": goto,
-                            "evmenu_current_nodename": nodename,
-                            "evmenu_goto_callables": goto_callables,
-                        },
-                    ),
-                }
-                if desc:
-                    option["desc"] = desc
-                options.append(option)
-
-        if inputparsemap:
-            # if this exists we must create a _default entry too
-            options.append(
-                {
-                    "key": "_default",
-                    "goto": (
-                        _generated_input_goto_func,
-                        {
-                            "evmenu_gotomap": inputparsemap,
-                            "evmenu_current_nodename": nodename,
-                            "evmenu_goto_callables": goto_callables,
-                        },
-                    ),
-                }
-            )
+def parse_menu_template_async(caller, menu_template, goto_callables=None):
+    """
+    Parse menu-template string like `parse_menu_template`, but do the parsing of
+    the template text in a thread. This keeps the server responsive when
+    parsing large templates.
+
+    Args:
+        caller (Object or Account): Entity using the menu.
+        menu_template (str): Menu described using the templating format.
+        goto_callables (dict, optional): Mapping between call-names and callables
+            on the form `callable(caller, raw_string, **kwargs)`. These are what is
+            available to use in the `menu_template` string.
 
-        return options
+    Returns:
+        Deferred: Fires with the `{"node": nodefunc}` menutree, suitable to pass
+            into EvMenu.
 
-    def _parse(caller, menu_template, goto_callables):
-        """
-        Parse the menu string format into a node tree.
-        """
-        nodetree = {}
-        splits = _RE_NODE.split(menu_template)
-        splits = splits[1:] if splits else []
-
-        # from evennia import set_trace;set_trace(term_size=(140,120))
-        content_map = {}
-        for node_ind in range(0, len(splits), 2):
-            nodename, nodetxt = splits[node_ind], splits[node_ind + 1]
-            text, *optiontxt = _RE_OPTIONS_SEP.split(nodetxt, maxsplit=2)
-            options = _parse_options(nodename, optiontxt, goto_callables)
-            content_map[nodename] = (text, options)
-            nodetree[nodename] = _generated_node
-        caller.db._evmenu_template_contents = content_map
-
-        return nodetree
-
-    return _parse(caller, menu_template, goto_callables)
+    Notes:
+        Only the parsing itself happens in the thread; the caller is only updated
+        once the Deferred fires in the main thread.
+
+    """
+    return deferToThread(_parse_template, menu_template).addCallback(
+        _build_menutree, caller, goto_callables
+    )
+
+
+def _build_menutree(parsed_template, caller, goto_callables):
+    """
+    Build the menutree from a parsed template and store the contents of its
+    nodes on the caller.
+
+    Args:
+        parsed_template (tuple): The parsed template from `_parse_template`.
+        caller (Object or Account): Entity using the menu.
+        goto_callables (dict or None): Mapping between call-names and callables.
+
+    Returns:
+        dict: A `{"node": nodefunc}` menutree suitable to pass into EvMenu.
+
+    """
+    nodetree = {}
+    content_map = {}
+    for nodename, text, options, gotomap in parsed_template:
+        content_map[nodename] = (
+            text,
+            _build_options(nodename, options, gotomap, goto_callables),
+        )
+        nodetree[nodename] = _generated_node
+    # the Attribute is needed for persistent menus, the nodes read the in-memory copy
+    caller.db._evmenu_template_contents = content_map
+    caller.ndb._evmenu_template_contents = content_map
+
+    return nodetree
 
 
 def template2menu(
@@ -0,0 +1,62 @@
+"""
+Tests of the GlobalScriptContainer
+
+"""
+
+from django.test import override_settings
+from evennia.utils.test_resources import EvenniaTest
+from evennia.scripts.models import ScriptDB
+from evennia.utils import containers
+
+_GLOBAL_SCRIPTS = {
+    "test_global_script": {"typeclass": "evennia.scripts.scripts.DefaultScript", "desc": "Test"}
+}
+
+
+@override_settings(GLOBAL_SCRIPTS=_GLOBAL_SCRIPTS)
+class TestGlobalScriptContainer(EvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.container = containers.GlobalScriptContainer()
+
+    def test_get_cached(self):
+        script = self.container.get("test_global_script")
+        self.assertEqual(script.key, "test_global_script")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.container.get("test_global_script"), script)
+            self.assertEqual(self.container.test_global_script, script)
+
+    def test_get_deleted(self):
+        script = self.container.get("test_global_script")
+        pk = script.pk
+        script.delete()
+        self.assertFalse(script.pk)
+        new_script = self.container.get("test_global_script")
+        self.assertTrue(new_script.pk)
+        self.assertNotEqual(new_script.pk, pk)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.container.get("not_a_global_script"))
+        self.assertNotIn("not_a_global_script", self.container._script_cache)
+
+    def test_invalidate(self):
+        script = self.container.get("test_global_script")
+        self.container.invalidate("test_global_script")
+        self.assertNotIn("test_global_script", self.container._script_cache)
+        self.assertEqual(self.container.get("test_global_script").pk, script.pk)
+        self.assertIn("test_global_script", self.container._script_cache)
+        self.container.invalidate()
+        self.assertEqual(self.container._script_cache, {})
+        self.assertEqual(self.container.get("test_global_script").pk, script.pk)
+
+    def test_start_reuses_existing(self):
+        script = self.container.get("test_global_script")
+        container = containers.GlobalScriptContainer()
+        container.start()
+        self.assertEqual(container.get("test_global_script").pk, script.pk)
+        self.assertEqual(ScriptDB.objects.filter(db_key="test_global_script").count(), 1)
+
+    def test_start_creates_missing(self):
+        self.assertFalse(ScriptDB.objects.filter(db_key="test_global_script").exists())
+        self.container.start()
+        self.assertEqual(ScriptDB.objects.filter(db_key="test_global_script").count(), 1)
@@ -10,6 +10,13 @@ class TestEvForm(TestCase):
 
     maxDiff = None
 
+    def _strip_form(self, form):
+        "Strip ansi, and the spaces at the end of lines, from a form's output."
+        form = ansi.strip_ansi(form)
+        # this is necessary since editors/black tend to strip lines spaces
+        # from the end of lines for the comparison strings.
+        return "\n".join(line.rstrip() for line in form.split("\n"))
+
     def _parse_form(self):
         "test evform. This is used by the unittest system."
         form = evform.EvForm("evennia.utils.tests.data.evform_example")
@@ -53,11 +60,7 @@ class TestEvForm(TestCase):
         formdict = {"FORMCHAR": 'x', "TABLECHAR": 'c', "FORM": form}
         form = evform.EvForm(form=formdict)
         form.map(cellsdict)
-        form = ansi.strip_ansi(str(form))
-        # this is necessary since editors/black tend to strip lines spaces
-        # from the end of lines for the comparison strings.
-        form = "\n".join(line.rstrip() for line in form.split("\n"))
-        return form
+        return self._strip_form(str(form))
 
     def test_form_consistency(self):
         """
@@ -76,11 +79,7 @@ class TestEvForm(TestCase):
         """
 
         form = self._parse_form()
-        form_noansi = ansi.strip_ansi(form)
-        # we must strip extra space at the end of output simply
-        # because editors tend to strip it when creating
-        # the comparison string ...
-        form_noansi = "\n".join(line.rstrip() for line in form_noansi.split("\n"))
+        form_noansi = self._strip_form(form)
 
         self.assertNotEqual(form, form_noansi)
         expected = """
@@ -23,7 +23,8 @@ from django.test import TestCase
 from evennia.utils.test_resources import EvenniaTest
 from evennia.utils import evmenu
 from evennia.utils import ansi
-from mock import MagicMock
+from mock import MagicMock, patch
+from twisted.internet.defer import succeed
 
 
 class TestEvMenu(TestCase):
@@ -265,6 +266,42 @@ class TestEvMenuExample(TestEvMenu):
         self.assertTrue(hasattr(self.menu, "testval"))
         self.assertTrue(hasattr(self.menu, "testval2"))
 
+    def test_safe_call_unhashable(self):
+        class _Callable:
+            def __eq__(self, other):
+                return self is other
+
+            def __call__(self, caller, raw_string, **kwargs):
+                return raw_string
+
+        self.assertEqual(self.menu._safe_call(_Callable(), "foo"), "foo")
+        self.assertEqual(self.menu._safe_call(_Callable().__call__, "bar"), "bar")
+
+    def test_parse_input_callable_msg_order(self):
+        menu = self.menu
+
+        def _exec(caller, raw_string, **kwargs):
+            menu.msg("from menu")
+
+        def _goto(caller, raw_string, **kwargs):
+            caller.msg(text="direct")
+            raise evmenu.EvMenuGotoAbortMessage("error")
+
+        menu.options = {"x": (_goto, {}, _exec, {})}
+        self.caller.msg.reset_mock()
+        menu.parse_input("x")
+        # menu texts and the callable's own messages arrive in the order they are sent
+        self.assertEqual(
+            [call[2]["text"] for call in self.caller.msg.mock_calls],
+            [("from menu", {"type": "menu"}), "direct", ("error", {"type": "menu"})],
+        )
+
+    def test_format_node_colored_after_plain(self):
+        self.menu._format_node("hello", [("look", "Look around")])
+        # ANSIStrings compare equal to their plain text, but must not share its cache entry
+        colored = self.menu._format_node("hello", [("look", ansi.ANSIString("|rLook around|n"))])
+        self.assertIn("\033[31m", ansi.ANSIString(colored).raw())
+
 
 def _callnode1(caller, raw_string, **kwargs):
     return "node1"
@@ -274,6 +311,14 @@ def _callnode2(caller, raw_string, **kwargs):
     return "node2"
 
 
+_CALLNODE3_CALLS = []
+
+
+def _callnode3(caller, raw_string, **kwargs):
+    _CALLNODE3_CALLS.append(kwargs)
+    return "start"
+
+
 class TestMenuTemplateParse(EvenniaTest):
     """Test menu templating helpers"""
 
@@ -324,6 +369,172 @@ class TestMenuTemplateParse(EvenniaTest):
         menutree = evmenu.parse_menu_template(self.char1, self.menu_template, self.goto_callables)
         self.assertEqual(menutree, {"start": Anything, "node1": Anything, "node2": Anything})
 
+    @patch("evennia.utils.evmenu.deferToThread", lambda func, *args: succeed(func(*args)))
+    def test_parse_menu_template_async(self):
+        """Async template parsing gives the same menutree"""
+
+        menutrees = []
+        deferred = evmenu.parse_menu_template_async(
+            self.char1, self.menu_template, self.goto_callables
+        )
+        deferred.addCallback(menutrees.append)
+        self.assertEqual(menutrees, [{"start": Anything, "node1": Anything, "node2": Anything}])
+        self.assertIn("node1", self.char1.ndb._evmenu_template_contents)
+
+    def test_generated_node_after_reload(self):
+        """Nodes fall back to the stored template contents if not in memory"""
+
+        menutree = evmenu.parse_menu_template(self.char1, self.menu_template, self.goto_callables)
+        text, _ = menutree["node1"](self.char1, "", _current_nodename="node1")
+        self.assertIn("Node 1", text)
+        del self.char1.ndb._evmenu_template_contents
+        text, options = menutree["node1"](self.char1, "", _current_nodename="node1")
+        self.assertIn("Node 1", text)
+        self.assertIn("fwd", options[0]["key"])
+        self.assertTrue(self.char1.ndb._evmenu_template_contents)
+
+    def test_close_menu_clears_template_contents(self):
+        """Closing a templated menu removes the stored and in-memory node contents"""
+
+        menu = evmenu.template2menu(
+            self.char1, self.menu_template, self.goto_callables, cmd_on_exit=None
+        )
+        self.assertTrue(self.char1.ndb._evmenu_template_contents)
+        menu.close_menu()
+        self.assertIsNone(self.char1.ndb._evmenu_template_contents)
+        self.assertIsNone(self.char1.db._evmenu_template_contents)
+
+    def test_input_goto(self):
+        """Matching of `>`-type options against user input"""
+        menutree = evmenu.parse_menu_template(self.char1, self.menu_template, self.goto_callables)
+        _, options = menutree["node2"](self.char1, "", _current_nodename="node2")
+        goto, kwargs = options[-1]["goto"]
+        self.assertEqual(goto(self.char1, "FOObar\n", **kwargs)[0], "node1")
+        self.assertEqual(goto(self.char1, "123", **kwargs)[0], "node2")
+        self.assertEqual(goto(self.char1, "back", **kwargs)[0], "start")
+        with self.assertRaises(evmenu.EvMenuGotoAbortMessage):
+            goto(self.char1, "other", **kwargs)
+
+    def test_input_goto_uppercase_glob(self):
+        """Globs match case-insensitively, before any regex pattern"""
+        template = """
+        ## NODE start
+
+        Text
+
+        ## OPTIONS
+
+        > y[a-z]+$: node1
+        > Y*: node2
+        """
+        menutree = evmenu.parse_menu_template(self.char1, template, {})
+        _, options = menutree["start"](self.char1, "", _current_nodename="start")
+        goto, kwargs = options[-1]["goto"]
+        # `y[a-z]+$` only matches "yes" as a regex, so the later glob wins
+        self.assertEqual(goto(self.char1, "yes", **kwargs)[0], "node2")
+        self.assertEqual(goto(self.char1, "YES", **kwargs)[0], "node2")
+
+    def test_input_goto_stored_dict(self):
+        """A `{pattern: goto}` gotomap stored by an older version still works"""
+        kwargs = {
+            "evmenu_gotomap": {"ab*": "node1", "[0-9]+": "node2"},
+            "evmenu_current_nodename": "start",
+            "evmenu_goto_callables": {},
+        }
+        goto = evmenu._generated_input_goto_func
+        self.assertEqual(goto(self.char1, "abc", **kwargs)[0], "node1")
+        self.assertEqual(goto(self.char1, "12", **kwargs)[0], "node2")
+        with self.assertRaises(evmenu.EvMenuGotoAbortMessage):
+            goto(self.char1, "other", **kwargs)
+
+    def test_input_goto_order(self):
+        """`>`-type options match in the order given, whatever their kind"""
+        template = """
+        ## NODE start
+
+        Text
+
+        ## OPTIONS
+
+        > f*: node1
+        > foo: node2
+        > bar: node2
+        > *: start
+        > baz: node1
+        """
+        menutree = evmenu.parse_menu_template(self.char1, template, {})
+        _, options = menutree["start"](self.char1, "", _current_nodename="start")
+        goto, kwargs = options[-1]["goto"]
+        self.assertEqual(goto(self.char1, "foo", **kwargs)[0], "node1")
+        self.assertEqual(goto(self.char1, "BAR", **kwargs)[0], "node2")
+        self.assertEqual(goto(self.char1, "baz", **kwargs)[0], "start")
+
+    def test_input_goto_case_range(self):
+        """Character ranges spanning both cases match the lower-case input only"""
+        template = """
+        ## NODE start
+
+        Text
+
+        ## OPTIONS
+
+        > [--^]: node1
+        > .-!b: node2
+        > *: start
+        """
+        menutree = evmenu.parse_menu_template(self.char1, template, {})
+        _, options = menutree["start"](self.char1, "", _current_nodename="start")
+        goto, kwargs = options[-1]["goto"]
+        self.assertEqual(goto(self.char1, "B", **kwargs)[0], "start")
+        self.assertEqual(goto(self.char1, "b", **kwargs)[0], "start")
+        self.assertEqual(goto(self.char1, "-", **kwargs)[0], "node1")
+
+    def test_goto_callable_kwargs(self):
+        """Kwargs of goto-callables may contain commas inside quotes and brackets"""
+        template = """
+        ## NODE start
+
+        Text
+
+        ## OPTIONS
+
+        next: callnode3(foo="a, b", bar=[1, 2], baz=3)
+        """
+        del _CALLNODE3_CALLS[:]
+        menutree = evmenu.parse_menu_template(self.char1, template, {"callnode3": _callnode3})
+        _, options = menutree["start"](self.char1, "", _current_nodename="start")
+        goto, kwargs = options[0]["goto"]
+        goto(self.char1, "next", **kwargs)
+        self.assertEqual(len(_CALLNODE3_CALLS), 1)
+        self.assertEqual(_CALLNODE3_CALLS[0]["foo"], "a, b")
+        self.assertEqual(_CALLNODE3_CALLS[0]["bar"], [1, 2])
+        self.assertEqual(_CALLNODE3_CALLS[0]["baz"], 3)
+
+    def test_goto_callable_kwargs_option_types(self):
+        """Goto-callables get the same kwargs from regular and `>`-type options"""
+        template = """
+        ## NODE start
+
+        Text
+
+        ## OPTIONS
+
+        next: callnode3(foo=1)
+        > other: callnode3(foo=1)
+        """
+        del _CALLNODE3_CALLS[:]
+        menutree = evmenu.parse_menu_template(self.char1, template, {"callnode3": _callnode3})
+        _, options = menutree["start"](self.char1, "", _current_nodename="start")
+        goto, kwargs = options[0]["goto"]
+        goto(self.char1, "next", **kwargs)
+        goto, kwargs = options[1]["goto"]
+        goto(self.char1, "other", **kwargs)
+        regular, pattern = _CALLNODE3_CALLS
+        for key in ("foo", "evmenu_current_nodename", "evmenu_goto_callables"):
+            self.assertEqual(regular[key], pattern[key])
+        self.assertEqual(regular["evmenu_goto"], "callnode3(foo=1)")
+        self.assertIn("evmenu_gotomap", pattern)
+
     def test_template2menu(self):
         evmenu.template2menu(self.char1, self.menu_template, self.goto_callables)
 
@@ -339,3 +550,47 @@ class TestMenuTemplateParse(EvenniaTest):
         """
         with self.assertRaises(RuntimeError):
             evmenu.parse_menu_template(self.char1, template, self.goto_callables)
+
+
+class TestGetInput(EvenniaTest):
+    """Test the get_input helper"""
+
+    def test_get_input(self):
+        calls = []
+
+        def _callback(caller, prompt, result, *args, **kwargs):
+            calls.append((caller, prompt, result, args, kwargs))
+
+        self.char1.msg = MagicMock()
+        evmenu.get_input(self.char1, "Name?", _callback, None, "arg", foo="bar")
+        self.char1.msg.assert_called_with("Name?", session=None)
+
+        cmd = evmenu.CmdGetInput()
+        cmd.caller = self.char1
+        cmd.session = self.session
+        cmd.raw_string = "Tom\n"
+        cmd.func()
+        self.assertEqual(calls, [(self.char1, "Name?", "Tom", ("arg",), {"foo": "bar"})])
+        self.assertFalse(self.char1.ndb._getinput)
+
+    def test_get_input_updated_state(self):
+        prompts = []
+
+        def _callback(caller, prompt, result, **kwargs):
+            prompts.append((prompt, kwargs))
+            if result == "again":
+                # the prompt state is read anew for every input
+                caller.ndb._getinput._prompt = "Really?"
+                caller.ndb._getinput._kwargs = {"retry": True}
+                return True
+
+        self.char1.msg = MagicMock()
+        evmenu.get_input(self.char1, "Name?", _callback)
+        cmd = evmenu.CmdGetInput()
+        cmd.caller = self.char1
+        cmd.session = self.session
+        for raw_string in ("again\n", "Tom\n"):
+            cmd.raw_string = raw_string
+            cmd.func()
+        self.assertEqual(prompts, [("Name?", {}), ("Really?", {"retry": True})])
+        self.assertFalse(self.char1.ndb._getinput)